@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from ttv_parser import archive, parser, tokenizer
+from ttv_parser.archive import Archive
+from test import synthetic
+from test.testdata import load_all
+
+YEAR = 2025
+
+class ArchiveTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "captures.txt")
+        self.texts = load_all() + [text for text, _ in synthetic.pages(seed=2, count=40, year=YEAR)]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("".join(self.texts))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_1_random_access(self):
+        with Archive(self.path, YEAR) as a:
+            self.assertEqual(len(a), len(self.texts))
+            for n in (0, 5, len(self.texts) - 1):
+                self.assertEqual(a.parse(n), parser.parse_report(self.texts[n], YEAR))
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+
+    def test_2_index_reused(self):
+        Archive(self.path, YEAR).close()
+        with mock.patch.object(archive, "build_index") as build, Archive(self.path, YEAR) as a:
+            build.assert_not_called()
+            self.assertEqual(len(a), len(self.texts))
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(self.texts[0])
+        with Archive(self.path, YEAR) as a:
+            self.assertEqual(len(a), len(self.texts) + 1)
+
+    def test_3_find(self):
+        expected = [parser.parse_report(text, YEAR) for text in self.texts]
+        with Archive(self.path, YEAR) as a:
+            day = date(YEAR, 1, 22)
+            self.assertListEqual(list(a.parse_pages(day)), [r for r in expected if r.head.date == day])
+            res = list(a.parse_pages(competition="RANSKAN LIGUE VAR"))
+            self.assertListEqual(res, [r for r in expected if r.head.competition == "RANSKAN LIGUE VAR"])
+            self.assertEqual(len(res), 1)
+
+    def test_4_heads_agree_with_tokenizer(self):
+        rows = "".join(self.texts).splitlines()
+        with Archive(self.path, YEAR) as a:
+            self.assertEqual(len(a), sum(tokenizer.is_report_head(row) for row in rows))
+
+    def test_5_closed_on_failed_index(self):
+        files = []
+        def record_open(*args, **kwargs):
+            files.append(open(*args, **kwargs)) # pylint: disable=consider-using-with
+            return files[-1]
+
+        with mock.patch.object(archive, "build_index", side_effect=ValueError), \
+                mock.patch.object(archive, "open", record_open, create=True):
+            with self.assertRaises(ValueError):
+                Archive(self.path, YEAR, rebuild=True)
+        self.assertTrue(files[0].closed)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
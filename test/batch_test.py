@@ -0,0 +1,36 @@
+import unittest
+
+from ttv_parser import batch, parser
+from test.testdata import load_all
+
+YEAR = 2025
+
+class BatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = load_all()
+        self.expected = [parser.parse_report(text, YEAR) for text in self.texts]
+
+    def test_1_compact_roundtrip(self):
+        for report in self.expected:
+            self.assertEqual(batch.from_compact(batch.to_compact(report)), report)
+
+    def test_2_in_process(self):
+        res = list(batch.parse_reports(self.texts, YEAR, workers=1, chunksize=3))
+        self.assertListEqual(res, self.expected)
+
+    def test_3_pool_ordered(self):
+        res = list(batch.parse_reports(self.texts * 3, YEAR, workers=2, chunksize=2))
+        self.assertListEqual(res, self.expected * 3)
+
+    def test_4_pool_unordered(self):
+        res = list(batch.parse_reports(self.texts, YEAR, workers=2, chunksize=2, ordered=False))
+        self.assertListEqual([report for _, report in sorted(res, key=lambda r: r[0])], self.expected)
+
+    def test_5_year_override(self):
+        items = [self.texts[0], (self.texts[0], 2020)]
+        first, second = batch.parse_reports(items, YEAR, workers=1)
+        self.assertEqual(first.head.date.year, YEAR)
+        self.assertEqual(second.head.date.year, 2020)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
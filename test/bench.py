@@ -0,0 +1,271 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from ttv_parser import metrics, parser, serializer
+from test import synthetic
+from test.testdata import load_all, paths
+
+YEAR = 2025
+
+def match_blocks(pages: List[str]) -> List[str]:
+    """
+    Blank line delimited match blocks of every page without the page head
+    """
+    blocks = []
+    for page in pages:
+        body = page.lstrip().split("\n", maxsplit=1)[1]
+        blocks += [block.strip("\n") for block in body.split("\n\n") if block.strip()]
+    return blocks
+
+def build_corpora(scale: int) -> Dict[str, List[str]]:
+    data = load_all()
+    head = data[0].lstrip().split("\n", maxsplit=1)[0]
+    blocks = match_blocks(data)
+
+    def page(n_matches: int, offset: int):
+        body = [blocks[(offset + i) % len(blocks)] for i in range(n_matches)]
+        return head + "\n\n" + "\n\n".join(body) + "\n"
+
+    return {
+        "data": data,
+        "multi-match": [page(20, i) for i in range(10 * scale)],
+        "multi-page": [page(1 + i % 8, i) for i in range(200 * scale)],
+        "synthetic": [text for text, _ in synthetic.pages(seed=0, count=200 * scale, year=YEAR)],
+    }
+
+def parse(text: str):
+    return parser.parse_report(text, YEAR)
+
+def parse_scoreboard(text: str):
+    return parser.parse_scoreboard(text, YEAR)
+
+def parse_and_serialize(text: str):
+    return serializer.dumps(parser.parse_report(text, YEAR))
+
+WORKLOADS: Dict[str, Callable] = {
+    "parse": parse,
+    "scoreboard": parse_scoreboard,
+    "serialize": serializer.dumps,
+    "parse+serialize": parse_and_serialize,
+}
+
+def run_workload(workload: Callable, items: list, matches: int, repeat: int):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            t0 = time.perf_counter_ns()
+            workload(item)
+            latencies.append(time.perf_counter_ns() - t0)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "pages_per_s": len(items) * repeat / elapsed,
+        "matches_per_s": matches * repeat / elapsed,
+        "p50_us": percentile(latencies, 50) / 1000,
+        "p99_us": percentile(latencies, 99) / 1000,
+    }
+
+def percentile(sorted_values: List[int], p: int):
+    i = min(len(sorted_values) - 1, round(p / 100 * (len(sorted_values) - 1)))
+    return sorted_values[i]
+
+def run(scale: int, repeat: int, only: List[str]):
+    results = {}
+    for corpus_name, texts in build_corpora(scale).items():
+        reports = [parse(text) for text in texts]
+        matches = sum(len(report.body) for report in reports)
+        for workload_name, workload in WORKLOADS.items():
+            name = f"{workload_name}/{corpus_name}"
+            if only and not any(o in name for o in only):
+                continue
+            items = reports if workload_name == "serialize" else texts
+            results[name] = run_workload(workload, items, matches, repeat)
+    return results
+
+# Run in a fresh interpreter so nothing is imported or cached yet, the
+# import itself is timed by -X importtime
+STARTUP_SCRIPT = """
+import sys, time
+from ttv_parser import parser
+t0 = time.perf_counter()
+parser.parse_report(open(sys.argv[1], encoding="utf-8").read(), 2025)
+print((time.perf_counter() - t0) * 1000)
+"""
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Self and cumulative microseconds and nesting level of every module in
+    -X importtime output, which has lines like
+    'import time:       120 |        450 |   ttv_parser.models'
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue # Column header
+        indent = len(name) - len(name.lstrip())
+        modules[name.strip()] = (int(self_us), int(cumulative_us), (indent - 1) // 2)
+    return modules
+
+def startup(runs: int, top: int = 5) -> dict:
+    """
+    Median milliseconds of importing the parser, read from -X importtime,
+    and of the first parse in a new process, what a short lived command
+    pays before any work is done. heaviest lists the modules with the
+    largest median self time the import pulls in.
+    """
+    page = str(paths()[0])
+    imports, parses = [], []
+    self_times: Dict[str, List[int]] = {}
+    for _ in range(runs):
+        res = subprocess.run([sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT, page],
+                             capture_output=True, text=True, check=True)
+        modules = parse_importtime(res.stderr)
+        # Top level entries of the package, everything else is nested in them
+        imports.append(sum(
+            cumulative for name, (_, cumulative, level) in modules.items()
+            if level == 0 and (name == "ttv_parser" or name.startswith("ttv_parser."))
+        ) / 1000)
+        parses.append(float(res.stdout))
+        for name, (self_us, _, _) in modules.items():
+            self_times.setdefault(name, []).append(self_us)
+    imports.sort()
+    parses.sort()
+    heaviest = sorted(
+        ((name, percentile(sorted(times), 50) / 1000) for name, times in self_times.items()),
+        key=lambda item: item[1], reverse=True
+    )[:top]
+    return {"import_ms": percentile(imports, 50), "first_parse_ms": percentile(parses, 50), "heaviest": heaviest}
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """
+    Returns names of benchmarks whose throughput dropped more than threshold
+    """
+    regressions = []
+    for name, base in baseline["results"].items():
+        if name not in results:
+            continue
+        change = results[name]["pages_per_s"] / base["pages_per_s"] - 1
+        marker = ""
+        if change < -threshold:
+            regressions.append(name)
+            marker = " REGRESSION"
+        print(f"{name:32} {base['pages_per_s']:12.0f} -> {results[name]['pages_per_s']:12.0f} pages/s {change:+7.1%}{marker}")
+    return regressions
+
+def print_results(results: dict):
+    print(f"{'benchmark':32} {'pages/s':>12} {'matches/s':>12} {'p50 us':>9} {'p99 us':>9}")
+    for name, res in results.items():
+        print(f"{name:32} {res['pages_per_s']:12.0f} {res['matches_per_s']:12.0f} {res['p50_us']:9.1f} {res['p99_us']:9.1f}")
+
+def print_stages(values: dict):
+    print(f"{'stage':32} {'calls':>12} {'seconds':>12}")
+    for name, stage in values["stages"].items():
+        print(f"{name:32} {stage['calls']:12} {stage['seconds']:12.3f}")
+
+def main(args: argparse.Namespace):
+    if args.metrics:
+        metrics.enable()
+    results = run(args.scale, args.repeat, args.only)
+    print_results(results)
+    if args.metrics:
+        print()
+        print_stages(metrics.snapshot())
+
+    cold = None
+    if args.startup_runs > 0:
+        cold = startup(args.startup_runs)
+        print(f"\nstartup: import {cold['import_ms']:.1f} ms, first parse {cold['first_parse_ms']:.1f} ms")
+        for name, ms in cold["heaviest"]:
+            print(f"  {name:<30} {ms:6.2f} ms self")
+
+    if args.save is not None:
+        Path(args.save).write_text(json.dumps({
+            "python": platform.python_version(),
+            "scale": args.scale,
+            "results": results,
+            "startup": cold,
+        }, indent=2), "utf-8")
+
+    if args.startup_budget is not None and cold is not None:
+        total = cold["import_ms"] + cold["first_parse_ms"]
+        if total > args.startup_budget:
+            print(f"Startup took {total:.1f} ms, over the budget of {args.startup_budget:.1f} ms", file=sys.stderr)
+            sys.exit(1)
+
+    if args.compare is not None:
+        baseline = json.loads(Path(args.compare).read_text("utf-8"))
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}", file=sys.stderr)
+            sys.exit(1)
+
+def args():
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Multiplier for the size of the generated corpora."
+    )
+    p.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Passes over each corpus."
+    )
+    p.add_argument(
+        "--only",
+        type=str,
+        nargs="*",
+        default=[],
+        help="Run only benchmarks whose name contains one of these."
+    )
+    p.add_argument(
+        "--save",
+        type=str,
+        help="File to save results to as a JSON baseline."
+    )
+    p.add_argument(
+        "--compare",
+        type=str,
+        help="Baseline file to compare results to. Exits with 1 on regression."
+    )
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed relative throughput drop against the baseline."
+    )
+    p.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record stage timings with ttv_parser.metrics, compare to a run without for its overhead."
+    )
+    p.add_argument(
+        "--startup-runs",
+        type=int,
+        default=10,
+        help="New processes to time importing and a first parse in, 0 skips."
+    )
+    p.add_argument(
+        "--startup-budget",
+        type=float,
+        help="Milliseconds allowed for import and first parse. Exits with 1 when exceeded."
+    )
+
+    return p.parse_args()
+
+if __name__ == "__main__":
+    main(args())
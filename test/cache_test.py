@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from ttv_parser import batch, parser
+from ttv_parser.interning import InternPool
+from ttv_parser.cache import DiskCache, ParseCache, content_key, open_disk_cache
+from test.testdata import load_all
+
+YEAR = 2025
+
+class CacheTest(unittest.TestCase):
+    def test_1_hits_equal_parse(self):
+        cache = ParseCache()
+        for text in load_all() * 2:
+            self.assertEqual(cache.parse_report(text, YEAR), parser.parse_report(text, YEAR))
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], stats["misses"])
+        self.assertEqual(stats["entries"], len(load_all()))
+
+    def test_2_key_includes_year(self):
+        cache = ParseCache()
+        text = load_all()[0]
+        self.assertEqual(cache.parse_report(text, 2020).head.date.year, 2020)
+        self.assertEqual(cache.parse_report(text, 2021).head.date.year, 2021)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_3_copy_on_return(self):
+        cache = ParseCache()
+        text = load_all()[0]
+        first = cache.parse_report(text, YEAR)
+        first.body[0].events.clear()
+        second = cache.parse_report(text, YEAR)
+        self.assertEqual(second, parser.parse_report(text, YEAR))
+        self.assertIsNot(second, cache.parse_report(text, YEAR))
+
+    def test_4_shared(self):
+        cache = ParseCache(copy=False)
+        text = load_all()[0]
+        self.assertIs(cache.parse_report(text, YEAR), cache.parse_report(text, YEAR))
+
+    def test_5_eviction(self):
+        texts = load_all()
+        cache = ParseCache(max_entries=2)
+        for text in texts[:3]:
+            cache.parse_report(text, YEAR)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        cache = ParseCache(max_entries=None, max_bytes=1)
+        cache.parse_report(texts[0], YEAR)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+
+    def test_6_disk_warm_restart(self):
+        texts = load_all()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            with DiskCache(path) as cache:
+                for text in texts:
+                    cache.parse_report(text, YEAR)
+                self.assertEqual(cache.stats()["misses"], len(texts))
+
+            expected = [parser.parse_report(text, YEAR) for text in texts]
+            with DiskCache(path) as cache, mock.patch.object(parser, "parse_report") as parse:
+                self.assertEqual([cache.parse_report(text, YEAR) for text in texts], expected)
+                parse.assert_not_called()
+                self.assertEqual(cache.stats()["hits"], len(texts))
+
+    def test_7_disk_prune(self):
+        texts = load_all()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            with DiskCache(path) as cache:
+                for text in texts:
+                    cache.parse_report(text, YEAR)
+                self.assertEqual(cache.prune(), 0)
+                self.assertGreater(cache.prune(max_bytes=cache.stats()["bytes"] // 2), 0)
+                self.assertLessEqual(cache.stats()["entries"], len(texts) // 2 + 1)
+
+                with mock.patch.object(parser, "PARSER_VERSION", parser.PARSER_VERSION + 1):
+                    cache.prune()
+                self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_8_parse_reports_with_cache(self):
+        texts = load_all()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            expected = [parser.parse_report(text, YEAR) for text in texts]
+            self.assertEqual(list(batch.parse_reports(texts, YEAR, workers=1, cache=path)), expected)
+            self.assertEqual(list(batch.parse_reports(texts, YEAR, workers=2, cache=path)), expected)
+
+    def test_9_disk_cache_per_process(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            parent = open_disk_cache(path)
+            self.assertIs(open_disk_cache(path), parent)
+            with mock.patch("os.getpid", return_value=os.getpid() + 1):
+                child = open_disk_cache(path)
+            self.assertIsNot(child, parent)
+            parent.close()
+            child.close()
+
+    def test_10_key_includes_interpreter(self):
+        text = load_all()[0]
+        key = content_key(text, YEAR, "tokenizer")
+        with mock.patch.object(sys.implementation, "cache_tag", "other-1"):
+            self.assertNotEqual(content_key(text, YEAR, "tokenizer"), key)
+
+    def test_11_hits_interned(self):
+        cache = ParseCache()
+        text = load_all()[0]
+        competition = cache.parse_report(text, YEAR).head.competition
+        pool = InternPool()
+        # Equal to the cached name but a different object
+        canonical = pool.intern("".join(list(competition)))
+        self.assertIs(cache.parse_report(text, YEAR, pool=pool).head.competition, canonical)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,83 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+from ttv_parser import incremental, parser
+from ttv_parser.models import Goal
+from test.testdata import load_text
+
+YEAR = 2025
+
+HEAD = "   ENGLANNIN VAR-LIIGA    22.01.    1/1 \n\n"
+UPCOMING = (
+    " Barham        - Foo Utd       16.00    \n"
+    "\n"
+    " Bazpool       - Null City     18.30    \n"
+)
+LIVE = (
+    " Barham        - Foo Utd       0-1      \n"
+    "                 McDominate   12        \n"
+    "\n"
+    " Bazpool       - Null City     18.30    \n"
+)
+LIVE_LATER = (
+    " Barham        - Foo Utd       1-1      \n"
+    " Pom          30 McDominate   12        \n"
+    "\n"
+    " Bazpool       - Null City     18.30    \n"
+)
+
+class IncrementalTest(unittest.TestCase):
+    def reparse(self, prev_text: str, new_text: str):
+        prev = parser.parse_report(prev_text, YEAR)
+        delta = incremental.reparse(prev, prev_text, new_text, YEAR)
+        self.assertEqual(delta.report, parser.parse_report(new_text, YEAR))
+        return prev, delta
+
+    def test_1_unchanged(self):
+        text = load_text("many_matches.txt")
+        prev, delta = self.reparse(text, text)
+        self.assertFalse(delta.changed)
+        for old, new in zip(prev.body, delta.report.body):
+            self.assertIs(old, new)
+
+    def test_2_kickoff_to_live(self):
+        prev, delta = self.reparse(HEAD + UPCOMING, HEAD + LIVE)
+        self.assertEqual(len(delta.parsed), 1)
+        self.assertIs(delta.report.body[1], prev.body[1])
+        self.assertEqual([m.host for m in delta.kicked_off], ["Barham"])
+        self.assertEqual([e.player for _, e in delta.new_goals], ["McDominate"])
+        self.assertEqual(len(delta.score_changes), 1)
+
+    def test_3_new_goal(self):
+        _, delta = self.reparse(HEAD + LIVE, HEAD + LIVE_LATER)
+        self.assertListEqual([(m.host, e.player) for m, e in delta.new_goals], [("Barham", "Pom")])
+        self.assertIsInstance(delta.new_goals[0][1], Goal)
+        self.assertListEqual(delta.kicked_off, [])
+        (old, new), = delta.score_changes
+        self.assertListEqual([old.ht_score, new.ht_score], [[0, 1], [1, 1]])
+
+    def test_4_added_and_removed(self):
+        first = load_text("goal_to_nil.txt")
+        second = load_text("many_matches.txt")
+        _, delta = self.reparse(first, second)
+        self.assertEqual([m.host for m in delta.added], ["Bazpool"])
+        self.assertListEqual(delta.removed, [])
+        _, delta = self.reparse(second, first)
+        self.assertEqual([m.host for m in delta.removed], ["Bazpool"])
+
+    def test_5_head_change(self):
+        text = load_text("goal_to_nil.txt")
+        _, delta = self.reparse(text, text.replace("22.01.", "23.01."))
+        self.assertTrue(delta.head_changed)
+        self.assertListEqual(delta.parsed, [])
+
+    def test_6_new_year(self):
+        prev_text = HEAD.replace("22.01.", "31.12.") + LIVE
+        prev = parser.parse_report(prev_text, YEAR)
+        with mock.patch.object(parser, "current_year", return_value=YEAR + 1):
+            delta = incremental.reparse(prev, prev_text, HEAD.replace("22.01.", "01.01.") + LIVE)
+        self.assertEqual(delta.report.head.date, date(YEAR + 1, 1, 1))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
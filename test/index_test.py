@@ -0,0 +1,80 @@
+import dataclasses
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from ttv_parser import parser
+from ttv_parser.index import ReportIndex
+from ttv_parser.models import EventType, RedCard, resolve_event_type
+from ttv_parser.table import GOAL_KINDS
+from test import synthetic
+from test.testdata import load_text, paths
+
+YEAR = 2025
+
+class IndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reports = [
+            parser.parse_report(path.read_text("utf-8"), YEAR)
+            for path in paths()
+        ] + [report for _, report in synthetic.pages(seed=3, count=200, year=YEAR)]
+        self.matches = [(report.head, match) for report in self.reports for match in report.body]
+        self.events = [(head, match, event) for head, match in self.matches for event in match.events]
+        self.index = ReportIndex()
+        self.index.extend(self.reports[:100])
+        for report in self.reports[100:]:
+            self.index.add(report)
+
+    def assertMatches(self, ids, expected):
+        self.assertGreater(len(expected), 0)
+        self.assertListEqual(list(self.index.table.iter_matches(ids)), expected)
+
+    def assertEvents(self, ids, expected):
+        self.assertGreater(len(expected), 0)
+        self.assertListEqual(list(self.index.table.iter_events(ids)), expected)
+
+    def test_1_team_matches(self):
+        expected = [m for _, m in self.matches if "Nottingham" in (m.host, m.visitor)]
+        self.assertMatches(self.index.matches(team="Nottingham"), expected)
+        self.assertListEqual(self.index.matches(team="Nobody"), [])
+
+    def test_2_player_goals(self):
+        expected = [e for _, _, e in self.events if e.player == "Gibbs-White" and resolve_event_type(e) in GOAL_KINDS]
+        self.assertEvents(self.index.events(player="Gibbs-White", kinds=GOAL_KINDS), expected)
+
+    def test_3_combined(self):
+        since, until = date(YEAR, 1, 1), date(YEAR, 3, 31)
+        expected = [
+            e for h, _, e in self.events
+            if isinstance(e, RedCard) and h.competition == "ENGLANTI VALIOLIIGA" and since <= h.date <= until
+        ]
+        ids = self.index.events(kinds=[EventType.RED_CARD], competition="ENGLANTI VALIOLIIGA", since=since, until=until)
+        self.assertEvents(ids, expected)
+
+        expected = [m for h, m in self.matches if h.competition == "SAKSAN BUNDESLIGA" and h.date >= since
+                    and h.date <= until and "Bayern" in (m.host, m.visitor)]
+        self.assertMatches(self.index.matches("Bayern", "SAKSAN BUNDESLIGA", since, until), expected)
+
+    def test_4_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "reports.idx")
+            self.index.save(path)
+            loaded = ReportIndex.load(path)
+        self.assertListEqual(list(loaded.table.reports()), self.reports)
+        self.assertListEqual(loaded.events(player="Wood", team="Nottingham"),
+                             self.index.events(player="Wood", team="Nottingham"))
+        loaded.add(self.reports[0])
+        self.assertEqual(len(loaded.matches(team=self.reports[0].body[0].host)),
+                         len(self.index.matches(team=self.reports[0].body[0].host)) + 1)
+
+    def test_5_competition_most_selective(self):
+        report = parser.parse_report(load_text("goals_to_goals.txt"), YEAR)
+        index = ReportIndex()
+        index.extend([report] * 5)
+        index.add(dataclasses.replace(report, head=dataclasses.replace(report.head, competition="SAKSAN BUNDESLIGA")))
+        self.assertListEqual(index.matches(team="Null City", competition="SAKSAN BUNDESLIGA"), [5])
+        self.assertListEqual(index.matches(team="Null City", competition="ENGLANNIN VAR-LIIGA"), [0, 1, 2, 3, 4])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+import io
+import json
+import shutil
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+from ttv_parser import ingest, parser
+
+YEAR = 2025
+
+class IngestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.pages = self.tmp / "pages"
+        shutil.copytree("test/data", self.pages)
+        self.names = sorted(p.name for p in self.pages.glob("*.txt"))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp)
+
+    def run_ingest(self, source, **kwargs):
+        out = io.StringIO()
+        ingest.ingest(str(source), out, year=YEAR, workers=1, **kwargs)
+        return [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_1_directory(self):
+        lines = self.run_ingest(self.pages)
+        self.assertListEqual([line["source"] for line in lines], self.names)
+        expected = parser.parse_report((self.pages / self.names[0]).read_text("utf-8"), YEAR)
+        self.assertDictEqual(lines[0]["report"], expected.json_value())
+
+    def test_2_tar(self):
+        archive = self.tmp / "pages.tar.gz"
+        with tarfile.open(archive, "w:gz") as tar:
+            for name in self.names:
+                tar.add(self.pages / name, arcname=name)
+        lines = self.run_ingest(archive)
+        self.assertListEqual([line["source"] for line in lines], self.names)
+
+    def test_3_error_line(self):
+        (self.pages / "zz_broken.txt").write_text("garbage\n", "utf-8")
+        lines = self.run_ingest(self.pages)
+        self.assertIn("error", lines[-1])
+        self.assertEqual(len(lines), len(self.names) + 1)
+
+    def test_4_resume(self):
+        checkpoint = str(self.tmp / "checkpoint.json")
+        first = self.run_ingest(self.pages, checkpoint=checkpoint, checkpoint_every=5)
+        self.assertEqual(ingest.read_checkpoint(checkpoint, str(self.pages))["done"], len(self.names))
+
+        # Pretend the run stopped after 5 pages
+        ingest.write_checkpoint(checkpoint, str(self.pages), 5, io.StringIO())
+        rest = self.run_ingest(self.pages, checkpoint=checkpoint)
+        self.assertListEqual(rest, first[5:])
+
+    def test_5_resume_output(self):
+        checkpoint = str(self.tmp / "checkpoint.json")
+        output = self.tmp / "out.jsonl"
+        with open(output, "w", encoding="utf-8") as out:
+            ingest.ingest(str(self.pages), out, year=YEAR, workers=1, checkpoint=checkpoint)
+        state = ingest.read_checkpoint(checkpoint, str(self.pages))
+        ingest.open_output(str(output), state).close()
+        self.assertEqual(output.stat().st_size, state["offset"])
+
+        output.unlink()
+        with self.assertRaises(ValueError):
+            ingest.open_output(str(output), state)
+        self.assertFalse(output.exists())
+
+        # An earlier run to standard output leaves no offset to resume a file from
+        with self.assertRaises(ValueError):
+            ingest.open_output(str(output), {**state, "offset": None})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
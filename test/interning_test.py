@@ -0,0 +1,52 @@
+import unittest
+
+from ttv_parser import interning, parser
+from ttv_parser.interning import InternPool
+from test.testdata import load_text
+
+YEAR = 2025
+
+class InterningTest(unittest.TestCase):
+    def test_1_shared_names(self):
+        pool = InternPool()
+        first = parser.parse_report(load_text("own_goal.txt"), YEAR, pool=pool)
+        second = parser.parse_report(load_text("own_goal.txt"), YEAR, pool=pool)
+        self.assertEqual(first, second)
+        self.assertIs(first.head.competition, second.head.competition)
+        self.assertIs(first.body[0].host, second.body[0].host)
+        self.assertIs(first.body[0].events[0].player, second.body[0].events[0].player)
+        # Event teams refer to the same object as the match's team
+        self.assertIs(first.body[0].events[0].team, first.body[0].visitor)
+
+        stats = pool.stats()
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["hit_rate"], 0.5)
+        self.assertGreater(stats["bytes_saved"], 0)
+
+    def test_2_engines(self):
+        pool = InternPool()
+        legacy = parser.parse_report(load_text("penalty.txt"), YEAR, engine="legacy", pool=pool)
+        tokenized = parser.parse_report(load_text("penalty.txt"), YEAR, pool=pool)
+        self.assertIs(legacy.body[0].visitor, tokenized.body[0].visitor)
+
+    def test_3_size_bound(self):
+        pool = InternPool(max_size=2)
+        for name in ["a", "b", "a", "c"]:
+            pool.intern(name)
+        self.assertEqual(len(pool), 2)
+        self.assertListEqual(list(pool.strings), ["a", "c"])
+        self.assertEqual(pool.stats()["evictions"], 1)
+
+    def test_4_default_pool(self):
+        pool = InternPool()
+        interning.set_default_pool(pool)
+        try:
+            parser.parse_report(load_text("many_matches.txt"), YEAR)
+        finally:
+            interning.set_default_pool(None)
+        self.assertIn("Foo Utd", pool.strings)
+        parser.parse_report(load_text("goals_to_goals.txt"), YEAR)
+        self.assertNotIn("Doc", pool.strings)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,7 +1,12 @@
+import io
 import json
+import time
 import unittest
 
+from ttv_parser import parser, serializer
+
 from ttv_parser.models import *
+from test.testdata import paths
 
 PLAYER = "Owen Goal"
 TEAM = "Stonks FC"
@@ -31,6 +36,49 @@ class JsonTest(unittest.TestCase):
             '{"event_type": "GOAL", "time": {"regular": 1, "added": null}, "player": "PP", "team": "TT", "type": "m"}'
         )
 
+    def test_3_dict(self):
+        value = serializer.to_json_value({"a": EventTime(1, 2), "b": [Goal(3, PLAYER, TEAM, "rp")]})
+        self.assertListEqual(list(value), ["a", "b"])
+        self.assertEqual(value["b"][0]["event_type"], "PENALTY")
+
+    def test_4_text_matches_json_dumps(self):
+        for path in paths():
+            with self.subTest(path.name):
+                rep = parser.parse_report(path.read_text("utf-8"), 2025)
+                for ensure_ascii in (False, True):
+                    expected = json.dumps(rep.json_value(), ensure_ascii=ensure_ascii)
+                    out = io.StringIO()
+                    serializer.dump(rep, out, ensure_ascii)
+                    self.assertEqual(out.getvalue(), expected)
+                    self.assertEqual(rep.json_text(ensure_ascii), expected)
+
+    def test_5_unsupported(self):
+        with self.assertRaises(NotImplementedError):
+            serializer.to_json_value(object())
+
+    def test_6_slotted_models(self):
+        models = [
+            Goal(1, PLAYER, TEAM, "m"),
+            RedCard(2, PLAYER, TEAM),
+            MissedPenalty(3, PLAYER, TEAM),
+            EventTime(90, 2),
+            Match("A", "B", None, [0, 0], [0, 0], []),
+        ]
+        for model in models:
+            with self.subTest(type(model).__name__):
+                self.assertFalse(hasattr(model, "__dict__"))
+
+    def test_7_kickoff(self):
+        kickoff = Kickoff.at(18, 30)
+        self.assertEqual(kickoff.struct_time, time.strptime("18.30", "%H.%M"))
+        self.assertListEqual([kickoff.tm_hour, kickoff.tm_min], [18, 30])
+        match = Match("A", "B", kickoff, None, None, [])
+        self.assertEqual(match.json_value()["kickoff"], "18.30")
+        self.assertEqual(json.loads(match.json_text())["kickoff"], "18.30")
+        self.assertEqual(serializer.to_json_value(kickoff.struct_time), "18.30")
+        with self.assertRaises(ValueError):
+            Kickoff.at(24, 0)
+
     def assert_event(self, event: Event, expected_type: EventType):
         expected = {
             "event_type": expected_type.value,
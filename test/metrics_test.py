@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from ttv_parser import metrics, parser, serializer, tokenizer
+from ttv_parser.models import ModelBase
+from test.testdata import load_all, paths
+
+YEAR = 2025
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = load_all()
+        self.expected = [parser.parse_report(text, YEAR) for text in self.texts]
+
+    def tearDown(self) -> None:
+        metrics.disable()
+        metrics.reset()
+
+    def test_1_counts(self):
+        metrics.enable()
+        reports = [parser.parse_report(text, YEAR) for text in self.texts]
+        for report in reports:
+            serializer.dumps(report)
+        self.assertListEqual(reports, self.expected)
+
+        values = metrics.snapshot()
+        matches = sum(len(report.body) for report in reports)
+        self.assertTrue(values["enabled"])
+        self.assertEqual(values["pages"], len(self.texts))
+        self.assertEqual(values["matches"], matches)
+        self.assertEqual(values["bytes"], sum(len(text.encode("utf-8")) for text in self.texts))
+        self.assertEqual(values["event_rows"], sum(
+            len(match.event_rows) for text in self.texts for match in parser.parse_report(text, YEAR, lazy=True).body
+        ))
+        stages = values["stages"]
+        self.assertEqual(stages["page"]["calls"], len(self.texts))
+        self.assertEqual(stages["finish_match"]["calls"], matches)
+        self.assertEqual(stages["serialize"]["calls"], len(self.texts))
+        self.assertGreater(stages["page"]["seconds"], stages["match_head"]["seconds"])
+        self.assertNotIn("buckets", stages["page"])
+
+    def test_2_disable_restores(self):
+        originals = (parser.parse_report, parser.parse_match_head, tokenizer.parse_match_head,
+                     parser.finish_match, serializer.dumps, ModelBase.json_value, dict(parser.HEAD_ENGINES))
+        metrics.enable()
+        metrics.enable()
+        self.assertIsNot(parser.parse_report, originals[0])
+        metrics.disable()
+        self.assertFalse(metrics.enabled())
+        self.assertEqual((parser.parse_report, parser.parse_match_head, tokenizer.parse_match_head,
+                          parser.finish_match, serializer.dumps, ModelBase.json_value, parser.HEAD_ENGINES),
+                         originals)
+
+        parser.parse_report(self.texts[0], YEAR)
+        self.assertEqual(metrics.snapshot()["pages"], 0)
+
+    def test_3_lazy_and_legacy(self):
+        metrics.enable()
+        report = parser.parse_report(self.texts[0], YEAR, engine="legacy", lazy=True)
+        values = metrics.snapshot()
+        self.assertEqual(values["matches"], len(report.body))
+        self.assertEqual(values["event_rows"], 0)
+        rows = sum(len(match.event_rows) for match in report.body)
+        for match in report.body:
+            match.events # pylint: disable=pointless-statement
+        self.assertGreater(rows, 0)
+        self.assertEqual(metrics.snapshot()["event_rows"], rows)
+
+    def test_4_histograms(self):
+        metrics.enable(histograms=True)
+        for text in self.texts:
+            parser.parse_report(text, YEAR)
+        stage = metrics.snapshot()["stages"]["match_head"]
+        counts = list(stage["buckets"].values())
+        self.assertListEqual(counts, sorted(counts))
+        self.assertEqual(stage["buckets"][float("inf")], stage["calls"])
+
+        text = metrics.prometheus_text()
+        self.assertIn(f"ttv_parser_pages_total {len(self.texts)}\n", text)
+        self.assertIn('ttv_parser_stage_calls_total{stage="match_head"} ' + str(stage["calls"]), text)
+        self.assertIn('ttv_parser_stage_duration_seconds_bucket{stage="match_head",le="+Inf"} ' + str(stage["calls"]),
+                      text)
+
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()["stages"]["match_head"]["buckets"][float("inf")], 0)
+
+    def test_5_environment(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ttv_parser.prom")
+            env = dict(os.environ, TTV_PARSER_METRICS="1", TTV_PARSER_METRICS_FILE=path)
+            subprocess.run([sys.executable, "-c", "from ttv_parser import parser; "
+                            f"parser.parse_report(open({str(paths()[0])!r}).read(), 2025)"],
+                           env=env, check=True)
+            text = Path(path).read_text("utf-8")
+        self.assertIn("ttv_parser_pages_total 1\n", text)
+        self.assertNotIn("histogram", text)
+
+    def test_6_streaming_counts(self):
+        metrics.enable()
+        rows = "".join(self.texts).splitlines(keepends=True)
+        matches = list(parser.iter_matches(iter(rows)))
+        pairs = list(parser.iter_report(iter(rows), YEAR))
+        values = metrics.snapshot()
+        self.assertEqual(len(matches), len(pairs))
+        self.assertEqual(values["pages"], 2 * len(self.texts))
+        self.assertEqual(values["bytes"], 2 * sum(len(text.encode("utf-8")) for text in self.texts))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,14 @@
 import unittest
 import copy
+import io
 
 from datetime import date
 from dataclasses import dataclass
-from typing import List
+from typing import List, get_type_hints
 
 from ttv_parser import parser
 from ttv_parser.models import Match, Goal, Report, RedCard, EventTime, ReportHead, MissedPenalty
-
-def load_text(fname: str):
-    with open(f"test/data/{fname}", "r") as f:
-        return f.read()
+from test.testdata import load_text
 
 @dataclass
 class TestReport:
@@ -319,6 +317,10 @@ class ParserTest(unittest.TestCase):
             [second.kickoff.tm_hour, second.kickoff.tm_min],
             [18, 30]
         )
+        self.assertEqual(second.json_value()["kickoff"], "18.30")
+        # Repeated kickoff times share one object
+        again = parser.parse_report(self.upcoming_matches.raw)
+        self.assertIs(again.body[1].kickoff, second.kickoff)
 
     def test_11_added_time(self):
         res = parser.parse_report(self.added_time.raw)
@@ -407,5 +409,51 @@ class ParserTest(unittest.TestCase):
         # Assert that no modifications were made
         self.assertReportsEqual(rep, rep_cpy)
 
+    def test_16_iter_matches_file(self):
+        with open("test/data/many_matches.txt", "r") as f:
+            matches = list(parser.iter_matches(f))
+        self.assertListEqual(matches, self.many_matches.expected.body)
+
+    def test_17_iter_report_concatenated(self):
+        pages = [self.own_goal, self.many_matches, self.dash_in_name]
+        capture = io.StringIO("".join(page.raw for page in pages))
+        actual = list(parser.iter_report(capture, DATE.year))
+        expected = [(page.expected.head, match) for page in pages for match in page.expected.body]
+        self.assertListEqual(actual, expected)
+
+    def test_18_no_trailing_newline(self):
+        res = parser.parse_report(self.goals_to_goals.raw.rstrip())
+        self.assertReportsEqual(res, self.goals_to_goals.expected)
+
+    def test_19_lazy(self):
+        for page in [self.goals_to_goals, self.many_matches, self.missed_penalty, self.red_card]:
+            res = parser.parse_report(page.raw, DATE.year, lazy=True)
+            self.assertFalse(any(match.materialized for match in res.body))
+            self.assertEqual(str(res), str(page.expected))
+            self.assertEqual(res.json_value(), page.expected.json_value())
+            self.assertTrue(all(match.materialized for match in res.body))
+            self.assertReportsEqual(res, page.expected)
+            self.assertEqual(page.expected.body, res.body)
+
+    def test_20_lazy_scores_only(self):
+        res = parser.parse_report(self.goals_to_goals.raw, DATE.year, lazy=True)
+        expected = self.goals_to_goals.expected.body[0]
+        self.assertEqual((res.body[0].host, res.body[0].ft_score), (expected.host, expected.ft_score))
+        self.assertFalse(res.body[0].materialized)
+        res.body[0].events = []
+        self.assertListEqual(res.body[0].events, [])
+
+    def test_21_scoreboard(self):
+        for page in [self.goals_to_goals, self.many_matches, self.ongoing_match, self.red_card]:
+            res = parser.parse_scoreboard(page.raw, DATE.year)
+            self.assertEqual(res.head, page.expected.head)
+            self.assertListEqual(
+                [(s.host, s.visitor, s.kickoff, s.ht_score, s.ft_score) for s in res.body],
+                [(m.host, m.visitor, m.kickoff, m.ht_score, m.ft_score) for m in page.expected.body]
+            )
+
+    def test_22_model_type_hints(self):
+        self.assertIs(get_type_hints(ReportHead)["date"], date)
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
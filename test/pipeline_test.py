@@ -0,0 +1,91 @@
+import asyncio
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from ttv_parser import parser
+from ttv_parser.models import Report
+from ttv_parser.pipeline import DirectorySource, MemorySource, PageSource, Pipeline, QueueSink
+from test.testdata import DATA, load_text, paths
+
+YEAR = 2025
+
+class CountingSource(PageSource):
+    def __init__(self, source: PageSource):
+        self.source = source
+        self.running = 0
+        self.max_running = 0
+
+    async def fetch(self, page: str) -> str:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return await self.source.fetch(page)
+
+class PipelineTest(unittest.TestCase):
+    def test_1_directory_source(self):
+        pages = [path.stem for path in paths()]
+        received = {}
+
+        async def sink(page, report):
+            received[page] = report
+
+        async def run():
+            source = CountingSource(DirectorySource(str(DATA)))
+            sent = await Pipeline(source, [sink], YEAR, fetch_concurrency=3).run_once(pages)
+            return source, sent
+
+        source, sent = asyncio.run(run())
+        self.assertListEqual(sent, pages)
+        self.assertLessEqual(source.max_running, 3)
+        for page in pages:
+            self.assertEqual(received[page], parser.parse_report(load_text(f"{page}.txt"), YEAR))
+
+    def test_2_skip_unchanged(self):
+        source = MemorySource({"235": load_text("ongoing_match.txt"), "236": load_text("red_card.txt")})
+
+        async def run():
+            queue = QueueSink()
+            pipeline = Pipeline(source, [queue], YEAR)
+            first = await pipeline.run_once(["235", "236"])
+            source.pages["235"] = load_text("goals_to_goals.txt")
+            second = await pipeline.run_once(["235", "236"])
+            return first, second, queue.queue.qsize()
+
+        first, second, received = asyncio.run(run())
+        self.assertListEqual(first, ["235", "236"])
+        self.assertListEqual(second, ["235"])
+        self.assertEqual(received, 3)
+
+    def test_3_errors(self):
+        source = MemorySource({"235": load_text("red_card.txt"), "236": "not a page"})
+
+        async def run(errors: str):
+            queue = QueueSink()
+            await Pipeline(source, [queue], YEAR, errors=errors).run_once(["235", "236", "237"])
+            return dict(queue.queue.get_nowait() for _ in range(queue.queue.qsize()))
+
+        received = asyncio.run(run("return"))
+        self.assertIsInstance(received["235"], Report)
+        self.assertIsInstance(received["236"], Exception)
+        self.assertIsInstance(received["237"], KeyError)
+        with self.assertRaises(Exception):
+            asyncio.run(run("raise"))
+
+    def test_4_process_executor_poll(self):
+        source = MemorySource({"235": load_text("many_matches.txt")})
+        received = []
+
+        async def sink(page, report):
+            received.append(report)
+
+        async def run():
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                pipeline = Pipeline(source, [sink], YEAR, executor=executor, skip_unchanged=False)
+                await pipeline.poll(["235"], interval=0, rounds=2)
+
+        asyncio.run(run())
+        self.assertListEqual(received, [parser.parse_report(load_text("many_matches.txt"), YEAR)] * 2)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,14 +1,15 @@
 import cProfile
 import pstats
+import sys
 
 from pathlib import Path
 
-def run(rep_text: str):
+def run(rep_text: str, engine: str = "tokenizer"):
     from ttv_parser import parser
 
     prof = cProfile.Profile()
     prof.enable()
-    parser.parse_report(rep_text)
+    parser.parse_report(rep_text, engine=engine)
     prof.disable()
 
     stats = pstats.Stats(prof).strip_dirs().sort_stats("cumulative")
@@ -16,4 +17,4 @@ def run(rep_text: str):
 
 if __name__ == "__main__":
     rep_text = Path("test/data/goals_to_goals.txt").read_text("utf-8")
-    run(rep_text)
+    run(rep_text, *sys.argv[1:2])
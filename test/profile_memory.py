@@ -30,6 +30,7 @@ def main(args: argparse.Namespace):
         return
 
     report_single(snapshot)
+    report_objects(parsed)
 
 def report_single(snapshot: tracemalloc.Snapshot):
     snapshot = filter_snapshot(snapshot)
@@ -54,6 +55,23 @@ def report_comparison(new: tracemalloc.Snapshot, old: tracemalloc.Snapshot):
     for stat in stats[:limit]:
         print(f"{fmt_file_and_line(stat)} Size={fmt_size(stat.size)} ({fmt_size(stat.size_diff)}) Blocks={stat.count}\n\t{fmt_trace(stat)}")
 
+def report_objects(parsed):
+    matches = parsed.body
+    events = [ev for match in matches for ev in match.events]
+    match_size = sum(object_size(match) for match in matches)
+    event_size = sum(object_size(ev) + object_size(ev.time) for ev in events)
+    print(f"Matches={len(matches)} Bytes/match={match_size / max(len(matches), 1):.0f}")
+    print(f"Events={len(events)} Bytes/event={event_size / max(len(events), 1):.0f} (with EventTime)")
+
+def object_size(o: object):
+    """
+    Size of the object itself and its instance dict, if any, excluding field values
+    """
+    size = sys.getsizeof(o)
+    if hasattr(o, "__dict__"):
+        size += sys.getsizeof(o.__dict__)
+    return size
+
 def filter_snapshot(snapshot: tracemalloc.Snapshot):
     return snapshot.filter_traces((
         tracemalloc.Filter(False, "<frozen importlib._bootstrap*"),
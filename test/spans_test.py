@@ -0,0 +1,42 @@
+import unittest
+
+from ttv_parser import parser, spans
+from test import synthetic
+from test.testdata import load_all
+
+YEAR = 2025
+
+class SpansTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.capture = "".join(load_all() + [text for text, _ in synthetic.pages(seed=1, count=50, year=YEAR)])
+        self.expected = list(parser.iter_report(self.capture.split("\n"), YEAR))
+
+    def test_1_matches_equal_parse(self):
+        res = list(spans.scan(self.capture))
+        self.assertEqual(len(res), len(self.expected))
+        for span, (head, match) in zip(res, self.expected):
+            self.assertEqual(span.match(), match)
+            self.assertEqual(span.report_head(YEAR), head)
+            self.assertEqual((span.host, span.visitor), (match.host, match.visitor))
+            self.assertEqual((span.kickoff, span.ht_score, span.ft_score), (match.kickoff, match.ht_score, match.ft_score))
+
+    def test_2_search(self):
+        res = [span for span in spans.scan(self.capture) if span.has_team("Nottingham")]
+        expected = [match for _, match in self.expected if "Nottingham" in (match.host, match.visitor)]
+        self.assertGreater(len(expected), 0)
+        self.assertListEqual([span.match() for span in res], expected)
+
+        res = [span for span in spans.scan(self.capture) if span.mentions("Wood")]
+        expected = [match for _, match in self.expected if any(e.player == "Wood" for e in match.events)]
+        self.assertGreater(len(expected), 0)
+        self.assertListEqual([span.match() for span in res], expected)
+
+    def test_3_fields_are_offsets(self):
+        text = load_all()[0]
+        span = next(spans.scan(text))
+        self.assertEqual(text[span.host_start:span.host_end], span.host)
+        self.assertEqual(span.scoreline, text[span.tail_start:span.tail_end])
+        self.assertIs(span.text, text)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
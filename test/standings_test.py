@@ -0,0 +1,98 @@
+import unittest
+from collections import Counter
+
+from ttv_parser import parser
+from ttv_parser.models import Goal, RedCard
+from ttv_parser.standings import Standings
+from test import synthetic
+from test.testdata import load_text
+
+YEAR = 2025
+COMPETITION = "ENGLANNIN VAR-LIIGA"
+
+def load(name: str):
+    return parser.parse_report(load_text(f"{name}.txt"), YEAR)
+
+def recompute(reports):
+    """
+    Points, goals and scorer counts by walking every finished match of the last report of each
+    """
+    matches = {}
+    for report in reports:
+        for match in report.body:
+            matches[(report.head.competition, report.head.date, match.host, match.visitor)] = match
+    points = Counter()
+    goals = Counter()
+    for (competition, _, host, visitor), match in matches.items():
+        if match.ft_score is None:
+            continue
+        host_goals, visitor_goals = match.ft_score
+        points[(competition, host)] += 3 if host_goals > visitor_goals else host_goals == visitor_goals
+        points[(competition, visitor)] += 3 if visitor_goals > host_goals else host_goals == visitor_goals
+        for event in match.events:
+            if isinstance(event, Goal) and event.type != "om":
+                goals[(competition, event.player, event.team)] += 1
+    return points, goals
+
+class StandingsTest(unittest.TestCase):
+    def test_1_matches_recompute(self):
+        reports = [report for _, report in synthetic.pages(seed=4, count=300, year=YEAR)]
+        standings = Standings()
+        for report in reports:
+            standings.add_report(report)
+
+        points, goals = recompute(reports)
+        actual_points = Counter({(c, row.team): row.points for c in standings.tables for row in standings.table(c)})
+        self.assertEqual(+actual_points, +points)
+        actual_goals = Counter({(c, s.player, s.team): s.goals for c in standings.players for s in standings.scorers(c)})
+        self.assertEqual(actual_goals, +goals)
+
+    def test_2_own_goal_and_penalty(self):
+        standings = Standings()
+        standings.add_report(load("own_goal"))
+        standings.add_report(load("penalty"))
+        players = standings.players[COMPETITION]
+        self.assertEqual(players[("Ramero", "Barham")].own_goals, 1)
+        self.assertNotIn("Ramero", [s.player for s in standings.scorers(COMPETITION)])
+        self.assertEqual((players[("Mac Tester", "Bazpool")].goals, players[("Mac Tester", "Bazpool")].penalties), (1, 1))
+
+        foo = standings.table(COMPETITION)[0]
+        self.assertEqual((foo.team, foo.played, foo.won, foo.points), ("Foo Utd", 2, 2, 6))
+        self.assertEqual((foo.goals_for, foo.goals_against), (5, 3))
+
+    def test_3_idempotent_corrections(self):
+        standings = Standings()
+        report = load("red_card")
+        self.assertEqual(standings.add_report(report), 1)
+        self.assertEqual(standings.add_report(report), 0)
+        self.assertEqual([s.player for s in standings.cards(COMPETITION)], ["Nanez"])
+        before = standings.table(COMPETITION)
+
+        corrected = load("red_card")
+        match = corrected.body[0]
+        match.ft_score = [2, 1]
+        match.events = [e for e in match.events if not isinstance(e, RedCard)]
+        match.events.append(Goal(85, "Nanez", match.host, "m"))
+        self.assertEqual(standings.add_report(corrected), 1)
+        self.assertEqual([(r.team, r.points, r.played) for r in standings.table(COMPETITION)],
+                         [(match.host, 3, 1), (match.visitor, 0, 1)])
+        self.assertEqual(standings.cards(COMPETITION), [])
+        self.assertEqual(standings.scorers(COMPETITION, limit=1)[0].goals, 2)
+
+        standings.add_report(report)
+        self.assertEqual(standings.table(COMPETITION), before)
+        self.assertTrue(standings.remove_match(COMPETITION, report.head.date, match.host, match.visitor))
+        self.assertEqual(standings.table(COMPETITION), [])
+        self.assertEqual(standings.players[COMPETITION], {})
+
+    def test_4_live(self):
+        report = load("ongoing_match")
+        self.assertEqual(Standings().add_report(report), 0)
+        standings = Standings(live=True)
+        standings.add_report(report)
+        self.assertEqual(sum(row.played for row in standings.table(COMPETITION)), 2 * sum(
+            1 for m in report.body if m.kickoff is None and (m.ft_score or m.ht_score) is not None
+        ))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
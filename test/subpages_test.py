@@ -0,0 +1,55 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from ttv_parser import parser
+from ttv_parser.subpages import SubpageError, parse_subpages
+from test.testdata import load_text
+
+YEAR = 2025
+
+def subpage(name: str, number: int, count: int):
+    text = load_text(f"{name}.txt")
+    return text.replace("1/1", f"{number}/{count}", 1)
+
+class SubpagesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = [
+            subpage("goals_to_goals", 1, 3),
+            subpage("many_matches", 2, 3),
+            subpage("red_card", 3, 3),
+        ]
+        self.body = [match for text in self.texts for match in parser.parse_report(text, YEAR).body]
+
+    def test_1_merge_in_subpage_order(self):
+        res = parse_subpages(self.texts[::-1], YEAR)
+        self.assertTrue(res.complete)
+        self.assertListEqual(res.duplicates, [])
+        report = res.report()
+        self.assertListEqual(report.body, self.body)
+        self.assertEqual(report.head.competition, "ENGLANNIN VAR-LIIGA")
+        self.assertListEqual(report.head.subpages, [3, 3])
+
+    def test_2_missing_and_duplicate(self):
+        res = parse_subpages([self.texts[0], self.texts[2], self.texts[2]], YEAR)
+        self.assertFalse(res.complete)
+        self.assertListEqual(res.missing, [2])
+        self.assertListEqual(res.duplicates, [3])
+        self.assertListEqual(res.report().head.subpages, [2, 3])
+        with self.assertRaises(SubpageError):
+            parse_subpages(self.texts[:2], YEAR, strict=True)
+
+    def test_3_inconsistent_counters(self):
+        with self.assertRaises(SubpageError):
+            parse_subpages([self.texts[0], subpage("red_card", 2, 2)], YEAR)
+        with self.assertRaises(SubpageError):
+            parse_subpages([self.texts[0], subpage("dash_in_name", 2, 3)], YEAR)
+        with self.assertRaises(SubpageError):
+            parse_subpages([subpage("red_card", 4, 3)], YEAR)
+
+    def test_4_executor(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            res = parse_subpages(self.texts, YEAR, executor=executor)
+        self.assertListEqual(res.body, self.body)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,252 @@
+"""
+Seeded generator of synthetic Teksti-TV pages with their expected reports.
+
+Every page is derived from the seed and its index alone so any page of a
+corpus can be regenerated without generating the ones before it.
+
+    python -m test.synthetic captures.txt --seed 1 --size 1G --expected expected.jsonl
+"""
+import argparse
+from datetime import date, timedelta
+import json
+import random
+import re
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+from ttv_parser.models import EventTime, Goal, Kickoff, Match, MissedPenalty, RedCard, Report, ReportHead
+
+COMPETITIONS = [
+    ["ENGLANTI", "VALIOLIIGA"],
+    ["ENGLANNIN", "VAR-LIIGA"],
+    ["ITALIAN", "SERIE", "A"],
+    ["SAKSAN", "BUNDESLIGA"],
+    ["RANSKAN", "LIGUE", "1"],
+    ["ESPANJAN", "LA", "LIGA"],
+    ["MESTARIEN", "LIIGA"],
+]
+
+TEAMS = [
+    "Wolverhampton", "Nottingham", "Man Utd", "Man City", "Liverpool", "Arsenal", "Brighton",
+    "Mainz 05", "Schalke 04", "Bayern", "Hertha", "Köln", "1860 Munich",
+    "Saint-Etienne", "Paris SG", "Le Havre", "Real Sociedad", "Atletico", "Celta",
+    "Bazpool", "Barham", "Foo Utd", "Null City", "Noice", "Saint-Buginne", "Many Goals",
+]
+
+FIRST_NAMES = ["", "", "", "Mac", "Van", "De", "Kevin", "Ali"]
+LAST_NAMES = [
+    "Wood", "Gibbs-White", "Awoniyi", "Halland", "Nanez", "McDominate", "Barnacho", "Mainoom",
+    "Pom", "Ramero", "Doc", "Tester", "Müller", "Søren", "Ödegaard", "Kane", "Salah", "Mbappe",
+    "Pukki", "Hradecky", "Jean-Pierre", "Ruiz-Lopez", "Oppa", "Rome", "Perm",
+]
+
+# Width of one event column including the leading space
+COLUMN = 16
+PAGE_WIDTH = 40
+
+def page_rng(seed: int, index: int):
+    return random.Random(f"{seed}:{index}")
+
+def player_name(rng: random.Random):
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    return f"{first} {last}" if first else last
+
+def competition_text(words: List[str], rng: random.Random):
+    # Column aligned heads separate words with arbitrary spacing
+    return "".join(word + " " * rng.randint(1, 3) for word in words).rstrip()
+
+def random_event_time(rng: random.Random, max_minute: int):
+    regular = rng.randint(1, max_minute)
+    added = None
+    if regular in (45, 90) and rng.random() < 0.4:
+        added = rng.randint(1, 7)
+    return EventTime(regular, added)
+
+def random_events(rng: random.Random, team: str, max_minute: int):
+    events = []
+    for _ in range(rng.choice([0, 0, 1, 1, 1, 2, 2, 3, 4])):
+        kind = rng.random()
+        event_time = random_event_time(rng, max_minute)
+        player = player_name(rng)
+        if kind < 0.75:
+            events.append(Goal(event_time, player, team, "m"))
+        elif kind < 0.82:
+            events.append(Goal(event_time, player, team, "om"))
+        elif kind < 0.9:
+            events.append(Goal(event_time, player, team, "rp"))
+        elif kind < 0.95:
+            events.append(MissedPenalty(event_time, player, team))
+        else:
+            events.append(RedCard(event_time, player, team))
+    events.sort(key=lambda e: e.time)
+    return events
+
+def event_marker(event):
+    time_str = str(event.time)
+    if isinstance(event, RedCard):
+        return "# " + time_str
+    if isinstance(event, MissedPenalty):
+        return "erp" + time_str
+    if event.type == "m":
+        return time_str
+    return event.type + time_str
+
+def event_cell(event):
+    marker = event_marker(event)
+    return " " + event.player + " " * max(1, COLUMN - 1 - len(event.player) - len(marker)) + marker
+
+def event_rows(host_events: list, visitor_events: list):
+    """
+    Rows of host events on the left and visitor events on the right,
+    along with the events in the order the parser finds them
+    """
+    rows = []
+    parse_order = []
+    for i in range(max(len(host_events), len(visitor_events))):
+        host = host_events[i] if i < len(host_events) else None
+        visitor = visitor_events[i] if i < len(visitor_events) else None
+        # A host cell is followed by exactly one space, an empty one by two or more
+        row = event_cell(host) if host is not None else " " * COLUMN
+        if visitor is not None:
+            row += event_cell(visitor)
+            parse_order.append(visitor)
+        if host is not None:
+            parse_order.append(host)
+        rows.append(row.ljust(PAGE_WIDTH))
+    parse_order.sort(key=lambda e: e.time)
+    return rows, parse_order
+
+def goals_for(events: list, last_minute: int = 200):
+    return sum(1 for e in events if isinstance(e, Goal) and e.time.regular <= last_minute)
+
+def random_match(rng: random.Random, host: str, visitor: str) -> Tuple[List[str], Match]:
+    state = rng.random()
+    if state < 0.15:
+        kickoff = Kickoff.at(rng.randint(12, 22), rng.choice([0, 0, 15, 30, 45]))
+        return [match_head(host, visitor, str(kickoff))], Match(host, visitor, kickoff, None, None, [])
+
+    ongoing = state < 0.3
+    max_minute = rng.randint(10, 89) if ongoing else 90
+    host_events = random_events(rng, host, max_minute)
+    visitor_events = random_events(rng, visitor, max_minute)
+    score = [goals_for(host_events), goals_for(visitor_events)]
+    ht_score = [goals_for(host_events, 45), goals_for(visitor_events, 45)]
+    rows, events = event_rows(host_events, visitor_events)
+
+    if ongoing and score != [0, 0]:
+        # A live score is parsed into ht_score until the final score is known
+        head = match_head(host, visitor, f"{score[0]}-{score[1]}")
+        return [head] + rows, Match(host, visitor, None, score, None, events)
+
+    if score == [0, 0]:
+        head = match_head(host, visitor, "0-0")
+        return [head] + rows, Match(host, visitor, None, [0, 0], [0, 0], events)
+
+    head = match_head(host, visitor, f"{score[0]}-{score[1]} ({ht_score[0]}-{ht_score[1]})")
+    return [head] + rows, Match(host, visitor, None, ht_score, score, events)
+
+def match_head(host: str, visitor: str, score: str):
+    return f" {host:<13} - {visitor:<13} {score}".ljust(PAGE_WIDTH)
+
+def random_page(seed: int, index: int, year: int) -> Tuple[str, Report]:
+    rng = page_rng(seed, index)
+    words = rng.choice(COMPETITIONS)
+    day = date(year, 1, 1) + timedelta(days=rng.randrange(365))
+    subpage_count = rng.choice([1, 1, 1, 2, 3, 4])
+    subpage = rng.randint(1, subpage_count)
+
+    head_text = f"   {competition_text(words, rng):<22} {day.strftime('%d.%m.')}    {subpage}/{subpage_count} "
+    head = ReportHead(" ".join(words), day, [subpage, subpage_count])
+
+    teams = rng.sample(TEAMS, 2 * rng.randint(1, 8))
+    blocks = []
+    matches = []
+    for host, visitor in zip(teams[::2], teams[1::2]):
+        rows, match = random_match(rng, host, visitor)
+        blocks.append("\n".join(rows))
+        matches.append(match)
+
+    text = head_text + "\n\n" + "\n\n".join(blocks) + "\n"
+    return text, Report(head, matches)
+
+def pages(seed: int = 0, count: Optional[int] = None, year: int = 2025, start: int = 0) \
+        -> Iterator[Tuple[str, Report]]:
+    """
+    (text, expected report) for pages start, start + 1, ... of the corpus,
+    endless when count is None
+    """
+    index = start
+    while count is None or index < start + count:
+        yield random_page(seed, index, year)
+        index += 1
+
+def write_corpus(out, seed: int, size: int, year: int = 2025, expected=None):
+    """
+    Writes concatenated pages to out until at least size characters are
+    written. Expected reports are written to expected as JSONL if given.
+    """
+    written = 0
+    count = 0
+    for text, report in pages(seed, year=year):
+        if written >= size:
+            break
+        out.write(text)
+        written += len(text)
+        count += 1
+        if expected is not None:
+            expected.write(report.json_text() + "\n")
+    return count
+
+def parse_size(size: str):
+    m = re.fullmatch(r"(\d+)([KMG]?)", size.upper())
+    if m is None:
+        raise argparse.ArgumentTypeError(f"Invalid size '{size}'")
+    return int(m.group(1)) * 1024 ** " KMG".index(m.group(2) or " ")
+
+def main(args: argparse.Namespace):
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    expected = None if args.expected is None else open(args.expected, "w", encoding="utf-8")
+    try:
+        count = write_corpus(out, args.seed, args.size, args.year, expected)
+    finally:
+        for f in (out, expected):
+            if f is not None and f is not sys.stdout:
+                f.close()
+    print(f"Wrote {count} pages", file=sys.stderr)
+
+def args():
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "output",
+        type=str,
+        help="File to write concatenated pages to, '-' for standard output."
+    )
+    p.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the corpus."
+    )
+    p.add_argument(
+        "--size",
+        type=parse_size,
+        default="1M",
+        help="Approximate size of the output e.g. 500K, 10M or 1G."
+    )
+    p.add_argument(
+        "--year",
+        type=int,
+        default=2025,
+        help="Year of the page dates."
+    )
+    p.add_argument(
+        "--expected",
+        type=str,
+        help="File to write expected reports to as JSONL."
+    )
+
+    return p.parse_args()
+
+if __name__ == "__main__":
+    main(args())
@@ -0,0 +1,44 @@
+import io
+import unittest
+
+from ttv_parser import parser
+from test import synthetic
+
+YEAR = 2025
+
+class SyntheticTest(unittest.TestCase):
+    def test_1_pages_parse_to_expected(self):
+        for text, expected in synthetic.pages(seed=1, count=300, year=YEAR):
+            for engine in ("tokenizer", "legacy"):
+                self.assertEqual(parser.parse_report(text, YEAR, engine=engine), expected, msg=text)
+
+    def test_2_deterministic(self):
+        first = list(synthetic.pages(seed=7, count=5))
+        again = list(synthetic.pages(seed=7, count=2, start=3))
+        self.assertListEqual(first[3:], again)
+        self.assertNotEqual(first, list(synthetic.pages(seed=8, count=5)))
+
+    def test_3_concatenated_corpus(self):
+        out = io.StringIO()
+        count = synthetic.write_corpus(out, seed=2, size=20_000, year=YEAR)
+        expected = [
+            (report.head, match)
+            for _, report in synthetic.pages(seed=2, count=count, year=YEAR)
+            for match in report.body
+        ]
+        out.seek(0)
+        self.assertListEqual(list(parser.iter_report(out, YEAR)), expected)
+
+    def test_4_covers_layouts(self):
+        reports = [report for _, report in synthetic.pages(seed=3, count=200)]
+        matches = [match for report in reports for match in report.body]
+        events = [event for match in matches for event in match.events]
+        self.assertTrue(any(match.kickoff is not None for match in matches))
+        self.assertTrue(any(match.ft_score is None and match.ht_score for match in matches))
+        self.assertTrue(any(event.time.added for event in events))
+        self.assertTrue(any(report.head.subpages[1] > 1 for report in reports))
+        for event_type in ("GOAL", "OWN_GOAL", "PENALTY", "MISSED_PENALTY", "RED_CARD"):
+            self.assertIn(event_type, {event.json_value()["event_type"] for event in events})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
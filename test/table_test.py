@@ -0,0 +1,55 @@
+import unittest
+
+from ttv_parser import parser
+from ttv_parser.models import EventType
+from ttv_parser.table import GOAL_KINDS, ReportTable
+from test.testdata import paths
+
+YEAR = 2025
+
+class TableTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reports = [
+            parser.parse_report(path.read_text("utf-8"), YEAR)
+            for path in paths()
+        ]
+        self.table = ReportTable()
+        self.table.extend(self.reports)
+
+    def test_1_roundtrip(self):
+        self.assertListEqual(list(self.table.reports()), self.reports)
+
+    def test_2_counts(self):
+        matches = [match for report in self.reports for match in report.body]
+        events = [event for match in matches for event in match.events]
+        self.assertEqual(len(self.table), len(self.reports))
+        self.assertEqual(len(self.table.matches), len(matches))
+        self.assertListEqual(list(self.table.iter_events()), events)
+
+    def test_3_goals_by_team_after_minute(self):
+        rows = self.table.events.scan(kinds=GOAL_KINDS, team="Foo Utd", after=80)
+        expected = [
+            event
+            for report in self.reports for match in report.body for event in match.events
+            if event.team == "Foo Utd" and event.time.regular > 80 and event.json_value()["event_type"] in
+                [kind.value for kind in GOAL_KINDS]
+        ]
+        self.assertListEqual(list(self.table.iter_events(rows)), expected)
+        self.assertTrue(expected)
+
+    def test_4_scan_filters(self):
+        red_cards = self.table.events.scan(kinds=[EventType.RED_CARD])
+        self.assertEqual([event.player for event in self.table.iter_events(red_cards)], ["Nanez"])
+        self.assertListEqual(self.table.events.scan(team="Nobody"), [])
+        halland = self.table.events.scan(player="Halland", before=30)
+        self.assertEqual([event.time.regular for event in self.table.iter_events(halland)], [23])
+
+    def test_5_match_scan(self):
+        rows = self.table.matches.scan("Bazpool")
+        for match in self.table.iter_matches(rows):
+            self.assertIn("Bazpool", (match.host, match.visitor))
+        competition, _ = self.table.head_of_match(rows[0])
+        self.assertEqual(competition, "ENGLANNIN VAR-LIIGA")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,15 @@
+"""
+Captured pages in test/data shared by the tests
+"""
+from pathlib import Path
+
+DATA = Path("test/data")
+
+def paths():
+    return sorted(DATA.glob("*.txt"))
+
+def load_text(fname: str):
+    return (DATA / fname).read_text("utf-8")
+
+def load_all():
+    return [path.read_text("utf-8") for path in paths()]
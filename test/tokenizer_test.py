@@ -0,0 +1,64 @@
+import unittest
+from datetime import date
+
+from ttv_parser import parser, tokenizer
+from ttv_parser.models import ReportHead
+from test.testdata import paths
+
+YEAR = 2025
+
+class TokenizerTest(unittest.TestCase):
+    def test_1_engines_agree_on_data(self):
+        for path in paths():
+            with self.subTest(path.name):
+                text = path.read_text("utf-8")
+                legacy = parser.parse_report(text, YEAR, engine="legacy")
+                tokenized = parser.parse_report(text, YEAR, engine="tokenizer")
+                self.assertEqual(tokenized, legacy)
+
+    def test_2_report_head(self):
+        heads = [
+            "   ITALIAN   SERIE  Ä     01.05.    1/2 ",
+            "   ENGLANTI   VALIOLIIGA  06.01.    1/1 ",
+            "SAKSAN BUNDESLIGA 2  30.11.  12/13 ",
+        ]
+        for head in heads:
+            with self.subTest(head):
+                self.assertEqual(
+                    tokenizer.parse_report_head(head, YEAR),
+                    parser.parse_report_head(head, YEAR)
+                )
+
+    def test_3_leap_day(self):
+        self.assertEqual(
+            tokenizer.parse_report_head("ENGLANTI VALIOLIIGA 29.02. 1/1", 2024),
+            ReportHead("ENGLANTI VALIOLIIGA", date(2024, 2, 29), [1, 1])
+        )
+
+    def test_4_match_head(self):
+        heads = [
+            "Mainz 05      - Foo Utd       1-2 (0-2)",
+            "Saint-Buginne - Noice         0-0",
+            "Null  City    - A - B         3-1 (1-1)",
+            "Barham        - Foo Utd       16.00",
+            "Lonely Team",
+        ]
+        for head in heads:
+            with self.subTest(head):
+                self.assertEqual(
+                    tokenizer.parse_match_head(head),
+                    parser.parse_match_head(head)
+                )
+
+    def test_5_long_head_is_linear(self):
+        # Legacy rescans digits at every index, tokenizer must not
+        head = "1" * 200_000 + " 01.05. 1/1"
+        res = tokenizer.parse_report_head(" FOO " + head, YEAR)
+        self.assertEqual(res.subpages, [1, 1])
+
+    def test_6_unknown_engine(self):
+        with self.assertRaises(KeyError):
+            parser.parse_report("", YEAR, engine="nope")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from ttv_parser import interning, parser
+from ttv_parser.worker import Worker
+from test.testdata import load_all
+
+YEAR = 2025
+
+def requests(texts):
+    return "".join(json.dumps({"id": i, "page": text, "year": YEAR}) + "\n" for i, text in enumerate(texts))
+
+class WorkerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.texts = load_all()
+        self.expected = [parser.parse_report(text, YEAR).json_value() for text in self.texts]
+
+    def test_1_pipelined(self):
+        out = io.StringIO()
+        worker = Worker()
+        worker.serve(io.StringIO(requests(self.texts * 2)), out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertListEqual([line["id"] for line in lines], list(range(2 * len(self.texts))))
+        self.assertListEqual([line["report"] for line in lines], self.expected * 2)
+        self.assertEqual(worker.cache.stats()["hits"], len(self.texts))
+
+    def test_2_errors(self):
+        out = io.StringIO()
+        Worker(cache_entries=0).serve(io.StringIO('{"id": "a", "page": "nothing"}\nnot json\n\n{"id": 3}\n'), out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertListEqual([line["id"] for line in lines], ["a", None, 3])
+        self.assertTrue(all("error" in line for line in lines))
+
+    def test_3_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "worker.sock")
+            server = Worker().make_server(path)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                    client.connect(path)
+                    client.sendall(requests(self.texts).encode("utf-8"))
+                    client.shutdown(socket.SHUT_WR)
+                    with client.makefile("r", encoding="utf-8") as f:
+                        lines = [json.loads(line) for line in f]
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+        self.assertListEqual([line["report"] for line in lines], self.expected)
+
+    def test_4_command(self):
+        res = subprocess.run(
+            [sys.executable, "-m", "ttv_parser", "worker"],
+            input=requests(self.texts[:2]), capture_output=True, text=True, check=True
+        )
+        self.assertListEqual([json.loads(line)["report"] for line in res.stdout.splitlines()], self.expected[:2])
+
+    def test_5_default_pool_untouched(self):
+        worker = Worker()
+        worker.serve(io.StringIO(requests(self.texts[:1])), io.StringIO())
+        self.assertIsNone(interning.default_pool())
+        self.assertGreater(len(worker.pool), 0)
+
+    def test_6_socket_path_reuse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "worker.sock")
+            Path(path).write_text("keep", "utf-8")
+            with self.assertRaises(FileExistsError):
+                Worker().make_server(path)
+            self.assertEqual(Path(path).read_text("utf-8"), "keep")
+            os.remove(path)
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+                stale.bind(path)
+            Worker().make_server(path).server_close()
+
+    def test_7_live_socket_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "worker.sock")
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as live:
+                live.bind(path)
+                live.listen()
+                with self.assertRaises(FileExistsError):
+                    Worker().make_server(path)
+                self.assertTrue(os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,5 @@
+import os
+
+if os.environ.get("TTV_PARSER_METRICS"):
+    from ttv_parser import metrics
+    metrics.enable_from_env()
@@ -0,0 +1,27 @@
+import argparse
+
+from ttv_parser import ingest, worker
+
+def args():
+    p = argparse.ArgumentParser(prog="python -m ttv_parser")
+    commands = p.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser(
+        "ingest",
+        help="Parse a directory, tar or zip archive of pages to JSONL."
+    )
+    ingest.add_arguments(ingest_parser)
+    ingest_parser.set_defaults(main=ingest.main)
+
+    worker_parser = commands.add_parser(
+        "worker",
+        help="Parse pages sent as NDJSON requests until the input ends."
+    )
+    worker.add_arguments(worker_parser)
+    worker_parser.set_defaults(main=worker.main)
+
+    return p.parse_args()
+
+if __name__ == "__main__":
+    parsed = args()
+    parsed.main(parsed)
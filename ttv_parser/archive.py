@@ -0,0 +1,147 @@
+"""
+Random access to large files of concatenated page captures.
+
+The file is memory mapped and the offsets of its pages are indexed once by
+their head rows, the 'COMPETITION  dd.mm.  n/m' row tokenizer.is_report_head
+recognises. The index is saved next to the file as <file>.idx and rebuilt
+when the file changes, so a page, or every page of a date or competition,
+is parsed without reading the rest of the file.
+
+    with Archive("captures-2025.txt", 2025) as archive:
+        for report in archive.parse_pages(competition="ENGLANTI VALIOLIIGA"):
+            ...
+"""
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import date
+import json
+import mmap
+import os
+import re
+from typing import Iterator, List, Optional
+
+from ttv_parser import parser, tokenizer
+from ttv_parser.models import Report
+
+INDEX_VERSION = 1
+
+# Same rows as tokenizer.is_report_head, date and counter captured
+_REPORT_HEAD_END = re.compile(tokenizer.REPORT_HEAD_END.encode(), re.MULTILINE)
+
+@dataclass(slots=True)
+class PageEntry:
+    start: int
+    end: int
+    competition: str
+    day: int
+    month: int
+    subpages: List[int]
+
+class Archive:
+    """
+    year is passed to the parser as pages only carry the day and month,
+    defaulting to the current year
+    """
+    def __init__(self, path: str, year: Optional[int] = None, index_path: Optional[str] = None,
+                 rebuild: bool = False):
+        self.path = path
+        self.year = parser.current_year() if year is None else year
+        self.index_path = path + ".idx" if index_path is None else index_path
+        # Closes the file and mapping if indexing fails
+        with ExitStack() as stack:
+            self.file = stack.enter_context(open(path, "rb"))
+            size = os.fstat(self.file.fileno()).st_size
+            # Empty files can not be mapped
+            self.data = b""
+            if size:
+                self.data = stack.enter_context(
+                    mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+            pages = None if rebuild else read_index(self.index_path, self.stamp())
+            if pages is None:
+                pages = build_index(self.data)
+                write_index(self.index_path, self.stamp(), pages)
+            stack.pop_all()
+        self.pages: List[PageEntry] = pages
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+    def stamp(self) -> dict:
+        st = os.fstat(self.file.fileno())
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def text(self, n: int) -> str:
+        page = self.pages[n]
+        return self.data[page.start:page.end].decode("utf-8")
+
+    def parse(self, n: int, **kwargs) -> Report:
+        """
+        Parses page n, kwargs are passed on to parser.parse_report
+        """
+        return parser.parse_report(self.text(n), self.year, **kwargs)
+
+    def find(self, day: Optional[date] = None, competition: Optional[str] = None) -> List[int]:
+        """
+        Numbers of the pages of day and competition, either may be None
+        """
+        return [
+            n for n, page in enumerate(self.pages)
+            if (day is None or (page.day, page.month) == (day.day, day.month))
+            and (competition is None or page.competition == competition)
+        ]
+
+    def parse_pages(self, day: Optional[date] = None, competition: Optional[str] = None,
+                    **kwargs) -> Iterator[Report]:
+        for n in self.find(day, competition):
+            yield self.parse(n, **kwargs)
+
+def build_index(data) -> List[PageEntry]:
+    """
+    Entries of every page in data, text before the first page head is skipped
+    """
+    pages = []
+    for head in _REPORT_HEAD_END.finditer(data):
+        start = data.rfind(b"\n", 0, head.start()) + 1
+        if pages:
+            pages[-1].end = start
+        competition = b" ".join(data[start:head.start()].split()).decode("utf-8")
+        day, month, subpage, subpage_count = (int(n) for n in head.groups())
+        pages.append(PageEntry(start, len(data), competition, day, month, [subpage, subpage_count]))
+    return pages
+
+def read_index(path: str, stamp: dict) -> Optional[List[PageEntry]]:
+    """
+    Saved index of path, None if it is missing or out of date
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION or index.get("stamp") != stamp:
+        return None
+    return [PageEntry(start, end, competition, day, month, subpages)
+            for start, end, competition, day, month, subpages in index["pages"]]
+
+def write_index(path: str, stamp: dict, pages: List[PageEntry]):
+    index = {
+        "version": INDEX_VERSION,
+        "stamp": stamp,
+        "pages": [[p.start, p.end, p.competition, p.day, p.month, p.subpages] for p in pages],
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp, path)
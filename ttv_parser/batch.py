@@ -0,0 +1,188 @@
+"""
+Parsing many pages at once over a process pool.
+
+Workers parse chunks of pages and send each chunk back as a single list of
+plain tuples (see to_compact) which is cheaper to pickle than model objects.
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from datetime import date
+from functools import partial
+from itertools import islice
+import os
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ttv_parser import interning, parser
+from ttv_parser.interning import InternPool
+from ttv_parser.models import Event, EventTime, Goal, Kickoff, Match, MissedPenalty, RedCard, Report, ReportHead
+
+ReportItem = Union[str, Tuple[str, int]]
+
+RED_CARD = "#"
+MISSED_PENALTY = "erp"
+
+def parse_reports(
+    reports: Iterable[ReportItem],
+    year: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    ordered: bool = True,
+    engine: str = "tokenizer",
+    errors: str = "raise",
+    pool: Optional[InternPool] = None,
+    cache: Optional[str] = None,
+) -> Iterator[Union[Report, Tuple[int, Report]]]:
+    """
+    Parses each item of reports, an item is either the page text or a
+    (text, year) pair overriding year for that page.
+
+    With ordered results are yielded as Reports in input order, otherwise
+    (index, Report) pairs are yielded as soon as their chunk is done.
+    Input is consumed lazily, at most two chunks per worker are in flight.
+    workers=1 parses in the calling process without a pool.
+    With errors="return" a page failing to parse yields its exception in
+    place of a Report instead of raising.
+    Names are interned in pool, or interning.default_pool(), as reports
+    arrive in this process.
+    cache is the path of a cache.DiskCache shared by the workers, pages found
+    in it are not parsed again.
+    """
+    if errors not in ("raise", "return"):
+        raise ValueError(f"Unsupported errors mode '{errors}'")
+    year = parser.current_year() if year is None else year
+    pool = interning.default_pool() if pool is None else pool
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(reports, year, chunksize)
+    parse = partial(parse_chunk, engine=engine, errors=errors, cache=cache)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from unpack_chunk(parse(chunk), ordered, pool)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if ordered:
+            yield from iter_ordered(executor, chunks, workers * 2, parse, pool)
+        else:
+            yield from iter_unordered(executor, chunks, workers * 2, parse, pool)
+
+def iter_ordered(executor: Executor, chunks: Iterator[list], window: int, parse: Callable,
+                 pool: Optional[InternPool]):
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(parse, chunk))
+        if len(pending) >= window:
+            yield from unpack_chunk(pending.popleft().result(), True, pool)
+
+    while pending:
+        yield from unpack_chunk(pending.popleft().result(), True, pool)
+
+def iter_unordered(executor: Executor, chunks: Iterator[list], window: int, parse: Callable,
+                   pool: Optional[InternPool]):
+    pending = set()
+    for chunk in chunks:
+        pending.add(executor.submit(parse, chunk))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from unpack_chunk(future.result(), False, pool)
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield from unpack_chunk(future.result(), False, pool)
+
+def iter_chunks(reports: Iterable[ReportItem], year: int, chunksize: int):
+    items = (
+        (i, item, year) if isinstance(item, str) else (i, *item)
+        for i, item in enumerate(reports)
+    )
+    while True:
+        chunk = list(islice(items, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def parse_chunk(chunk: List[Tuple[int, str, int]], engine: str = "tokenizer", errors: str = "raise",
+                cache: Optional[str] = None):
+    if cache is None:
+        parse = lambda text, year: to_compact(parser.parse_report(text, year, engine=engine))
+    else:
+        # Imported here since ttv_parser.cache builds on this module
+        from ttv_parser.cache import open_disk_cache # pylint: disable=import-outside-toplevel
+        parse = partial(open_disk_cache(cache).parse_compact, engine=engine)
+
+    ret = []
+    for i, text, year in chunk:
+        try:
+            ret.append((i, parse(text, year)))
+        except Exception as e: # pylint: disable=broad-exception-caught
+            if errors == "raise":
+                raise
+            ret.append((i, e))
+    return ret
+
+def unpack_chunk(chunk: list, ordered: bool, pool: Optional[InternPool] = None):
+    for i, compact in chunk:
+        report = compact if isinstance(compact, Exception) else from_compact(compact)
+        if pool is not None and not isinstance(report, Exception):
+            pool.intern_report(report)
+        yield report if ordered else (i, report)
+
+def to_compact(report: Report) -> tuple:
+    head = report.head
+    return (
+        head.competition,
+        head.date.toordinal(),
+        tuple(head.subpages),
+        tuple(compact_match(match) for match in report.body),
+    )
+
+def from_compact(compact: tuple) -> Report:
+    competition, ordinal, subpages, matches = compact
+    return Report(
+        ReportHead(competition, date.fromordinal(ordinal), list(subpages)),
+        [expand_match(match) for match in matches]
+    )
+
+def compact_match(match: Match):
+    return (
+        match.host,
+        match.visitor,
+        None if match.kickoff is None else int(match.kickoff),
+        None if match.ht_score is None else tuple(match.ht_score),
+        None if match.ft_score is None else tuple(match.ft_score),
+        tuple(compact_event(event) for event in match.events),
+    )
+
+def expand_match(compact: tuple):
+    host, visitor, kickoff, ht_score, ft_score, events = compact
+    return Match(
+        host,
+        visitor,
+        None if kickoff is None else Kickoff(kickoff),
+        None if ht_score is None else list(ht_score),
+        None if ft_score is None else list(ft_score),
+        [expand_event(event) for event in events]
+    )
+
+def compact_event(event: Event):
+    if isinstance(event, Goal):
+        kind = event.type
+    elif isinstance(event, RedCard):
+        kind = RED_CARD
+    elif isinstance(event, MissedPenalty):
+        kind = MISSED_PENALTY
+    else:
+        raise TypeError(f"Unsupported event (type={type(event)})")
+
+    return (kind, event.time.regular, event.time.added, event.player, event.team)
+
+def expand_event(compact: tuple):
+    kind, regular, added, player, team = compact
+    event_time = EventTime(regular, added)
+    if kind == RED_CARD:
+        return RedCard(event_time, player, team)
+    if kind == MISSED_PENALTY:
+        return MissedPenalty(event_time, player, team)
+    return Goal(event_time, player, team, kind)
@@ -0,0 +1,207 @@
+"""
+Caching of parse results keyed by a hash of the page text, in memory with
+ParseCache or on disk across processes and restarts with DiskCache.
+"""
+from collections import OrderedDict
+import hashlib
+import marshal
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+from ttv_parser import batch, interning, parser
+from ttv_parser.interning import InternPool
+from ttv_parser.models import Report
+
+def content_key(text: str, year: int, engine: str) -> bytes:
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16)
+    # marshal output is only guaranteed to load in the interpreter that wrote it
+    digest.update(
+        f"\0{year}\0{engine}\0{parser.PARSER_VERSION}\0{sys.implementation.cache_tag}".encode()
+    )
+    return digest.digest()
+
+def compact_size(o) -> int:
+    """
+    Approximate bytes held by a compact report
+    """
+    if isinstance(o, tuple):
+        return sys.getsizeof(o) + sum(compact_size(item) for item in o)
+    return sys.getsizeof(o)
+
+class ParseCache:
+    """
+    In-memory LRU cache in front of parser.parse_report.
+
+    Entries are evicted least recently used first once there are more than
+    max_entries of them or they take more than max_bytes. With copy every
+    hit returns a new Report so callers may modify it freely, otherwise the
+    same Report is returned for every hit and must be treated as read only.
+    Names of copies are interned in pool, or interning.default_pool(), like
+    those of a freshly parsed report.
+    """
+    def __init__(self, max_entries: Optional[int] = 1024, max_bytes: Optional[int] = None,
+                 copy: bool = True):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.copy = copy
+        self.entries: OrderedDict[bytes, tuple] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def parse_report(self, report: str, year: Optional[int] = None, engine: str = "tokenizer",
+                     pool: Optional[InternPool] = None) -> Report:
+        year = parser.current_year() if year is None else year
+        pool = interning.default_pool() if pool is None else pool
+        key = content_key(report, year, engine)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            value, _ = entry
+            if not self.copy:
+                return value
+            res = batch.from_compact(value)
+            return res if pool is None else pool.intern_report(res)
+
+        self.misses += 1
+        res = parser.parse_report(report, year, engine=engine, pool=pool)
+        # Copies are rebuilt from the compact form which nobody can modify
+        compact = batch.to_compact(res)
+        size = compact_size(compact)
+        self.entries[key] = (compact if self.copy else res, size)
+        self.bytes += size
+        self.evict()
+        return res
+
+    def evict(self):
+        while self.entries and (
+            (self.max_entries is not None and len(self.entries) > self.max_entries)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+class DiskCache:
+    """
+    Parse results stored in a SQLite database, shared by any number of
+    processes. Results are stored in the compact form of ttv_parser.batch
+    serialized with marshal and keyed by content_key, which covers the page
+    text, year, engine, parser.PARSER_VERSION and the interpreter version.
+    """
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        # Write ahead logging lets readers proceed while another process writes
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key BLOB PRIMARY KEY, version INTEGER, created REAL, size INTEGER, value BLOB)"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def parse_report(self, report: str, year: Optional[int] = None,
+                     engine: str = "tokenizer") -> Report:
+        return batch.from_compact(self.parse_compact(report, year, engine))
+
+    def parse_compact(self, report: str, year: Optional[int] = None,
+                      engine: str = "tokenizer") -> tuple:
+        year = parser.current_year() if year is None else year
+        key = content_key(report, year, engine)
+        row = self.db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self.hits += 1
+            return marshal.loads(row[0])
+
+        self.misses += 1
+        compact = batch.to_compact(parser.parse_report(report, year, engine=engine))
+        value = marshal.dumps(compact)
+        self.db.execute(
+            "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?)",
+            (key, parser.PARSER_VERSION, time.time(), len(value), value)
+        )
+        return compact
+
+    def prune(self, max_age: Optional[float] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Removes results of other parser versions, results older than max_age
+        seconds and the oldest results until at most max_bytes remain.
+        Returns the number of removed results.
+        """
+        removed = self.db.execute(
+            "DELETE FROM results WHERE version != ?", (parser.PARSER_VERSION,)
+        ).rowcount
+        if max_age is not None:
+            removed += self.db.execute(
+                "DELETE FROM results WHERE created < ?", (time.time() - max_age,)
+            ).rowcount
+        if max_bytes is not None:
+            removed += self.db.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM ("
+                "SELECT key, SUM(size) OVER (ORDER BY created DESC, key) AS total FROM results"
+                ") WHERE total > ?)",
+                (max_bytes,)
+            ).rowcount
+        return removed
+
+    def stats(self) -> dict:
+        entries, size = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+_disk_caches: Dict[Tuple[int, str], DiskCache] = {}
+
+def open_disk_cache(path: str) -> DiskCache:
+    """
+    DiskCache of path shared within this process
+    """
+    # A SQLite connection must not be used across fork, so a forked worker
+    # opens its own instead of using the one inherited from its parent
+    key = (os.getpid(), path)
+    disk_cache = _disk_caches.get(key)
+    if disk_cache is None:
+        disk_cache = _disk_caches[key] = DiskCache(path)
+    return disk_cache
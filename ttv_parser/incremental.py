@@ -0,0 +1,122 @@
+"""
+Incremental re-parsing of a polled page against its previous parse.
+
+Match blocks whose text did not change between polls are not parsed again,
+their Match objects are reused as is. The result lists what changed so
+consumers only need to process the difference.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ttv_parser import interning, parser
+from ttv_parser.interning import InternPool
+from ttv_parser.models import Event, Goal, Match, Report
+
+@dataclass(slots=True)
+class ReportDelta:
+    report: Report
+    parsed: List[Match] = field(default_factory=list)
+    new_events: List[Tuple[Match, Event]] = field(default_factory=list)
+    score_changes: List[Tuple[Match, Match]] = field(default_factory=list)
+    kicked_off: List[Match] = field(default_factory=list)
+    added: List[Match] = field(default_factory=list)
+    removed: List[Match] = field(default_factory=list)
+    head_changed: bool = False
+
+    @property
+    def new_goals(self) -> List[Tuple[Match, Goal]]:
+        return [(match, event) for match, event in self.new_events if isinstance(event, Goal)]
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.parsed) or bool(self.removed) or self.head_changed
+
+def split_page(text: str) -> Tuple[str, List[str]]:
+    """
+    Head row and blank line delimited match blocks of a page
+    """
+    head, body = text.lstrip().split("\n", maxsplit=1)
+    blocks = []
+    rows = []
+    for row in body.split("\n"):
+        if parser.isblank(row):
+            if rows:
+                blocks.append("\n".join(rows))
+                rows = []
+        else:
+            rows.append(row)
+    if rows:
+        blocks.append("\n".join(rows))
+    return head, blocks
+
+def reparse(prev_report: Report, prev_text: str, new_text: str, year: Optional[int] = None,
+            engine: str = "tokenizer", pool: Optional[InternPool] = None) -> ReportDelta:
+    """
+    Parses new_text reusing matches of prev_report, which must be the result
+    of parsing prev_text, for every match block whose text is unchanged.
+    year defaults to parser.current_year() as in parser.parse_report.
+    """
+    parse_head, parse_match = parser.HEAD_ENGINES[engine]
+    pool = interning.default_pool() if pool is None else pool
+    year = parser.current_year() if year is None else year
+
+    prev_head, prev_blocks = split_page(prev_text)
+    new_head, new_blocks = split_page(new_text)
+
+    reusable: Dict[str, Match] = {}
+    if len(prev_blocks) == len(prev_report.body):
+        reusable = dict(zip(prev_blocks, prev_report.body))
+
+    head = prev_report.head
+    head_changed = new_head != prev_head
+    if head_changed:
+        head = parser.intern_head(parse_head(new_head, year), pool)
+
+    delta = ReportDelta(Report(head, []), head_changed=head_changed)
+    for block in new_blocks:
+        match = reusable.get(block)
+        if match is None:
+            match = parse_block(block, parse_match, pool)
+            delta.parsed.append(match)
+        delta.report.body.append(match)
+
+    diff_matches(delta, prev_report.body)
+    return delta
+
+def parse_block(block: str, parse_match, pool: Optional[InternPool]) -> Match:
+    rows = block.split("\n")
+    match = parse_match(rows[0].strip())
+    for row in rows[1:]:
+        match.events += parser.parse_match_event_row_reverse(row, match)
+    return parser.finish_match(match, pool)
+
+def diff_matches(delta: ReportDelta, prev_matches: List[Match]):
+    prev_by_teams = {(m.host, m.visitor): m for m in prev_matches}
+    for match in delta.parsed:
+        prev = prev_by_teams.get((match.host, match.visitor))
+        if prev is None:
+            delta.added.append(match)
+            delta.new_events += [(match, event) for event in match.events]
+            continue
+
+        if prev.kickoff is not None and match.kickoff is None:
+            delta.kicked_off.append(match)
+        if (prev.ht_score, prev.ft_score) != (match.ht_score, match.ft_score):
+            delta.score_changes.append((prev, match))
+        delta.new_events += [(match, event) for event in new_events(prev.events, match.events)]
+
+    still_present = {(m.host, m.visitor) for m in delta.report.body}
+    delta.removed = [m for key, m in prev_by_teams.items() if key not in still_present]
+
+def new_events(prev: List[Event], new: List[Event]) -> List[Event]:
+    """
+    Events of new not in prev, counting duplicates
+    """
+    unmatched = list(prev)
+    ret = []
+    for event in new:
+        if event in unmatched:
+            unmatched.remove(event)
+        else:
+            ret.append(event)
+    return ret
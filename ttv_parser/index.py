@@ -0,0 +1,255 @@
+"""
+Inverted indexes over a ReportTable.
+
+Teams, players, competitions, dates and event kinds map to posting lists of
+match and event ids, the row numbers of the matches and events in the
+table. Ids only grow as reports are added so every posting list is sorted.
+Combined filters walk the shortest posting list and check its ids against
+the table columns, so queries cost as much as their most selective filter.
+
+    index = ReportIndex()
+    index.extend(reports)
+    for match in index.table.iter_matches(index.matches(team="Nottingham")):
+        ...
+"""
+from array import array
+from datetime import date
+from itertools import compress
+import marshal
+import operator
+from operator import itemgetter
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ttv_parser.models import EventType, Report
+from ttv_parser.table import KIND_CODES, ReportTable
+
+FORMAT_VERSION = 1
+
+Postings = Dict[int, array]
+
+POSTINGS = (
+    "team_matches", "competition_matches", "date_matches",
+    "player_events", "team_events", "kind_events", "competition_events", "date_events",
+)
+
+class ReportIndex:
+    """
+    Reports added to table directly are indexed on the next update, add
+    and extend index them right away.
+    """
+    def __init__(self, table: Optional[ReportTable] = None):
+        self.table = ReportTable() if table is None else table
+        self.team_matches: Postings = {}
+        self.competition_matches: Postings = {}
+        self.date_matches: Postings = {}
+        self.player_events: Postings = {}
+        self.team_events: Postings = {}
+        self.kind_events: Postings = {}
+        self.competition_events: Postings = {}
+        self.date_events: Postings = {}
+        self.indexed_matches = 0
+        self.indexed_events = 0
+        self.update()
+
+    def add(self, report: Report):
+        self.table.append(report)
+        self.update()
+
+    def extend(self, reports: Iterable[Report]):
+        self.table.extend(reports)
+        self.update()
+
+    def update(self):
+        """
+        Indexes matches and events added to the table since the last update
+        """
+        table = self.table
+        matches = table.matches
+        events = table.events
+        for i in range(self.indexed_matches, len(matches)):
+            report = matches.report[i]
+            competition = table.competition[report]
+            day = table.date[report]
+            post(self.team_matches, matches.host[i], i)
+            if matches.visitor[i] != matches.host[i]:
+                post(self.team_matches, matches.visitor[i], i)
+            post(self.competition_matches, competition, i)
+            post(self.date_matches, day, i)
+            for j in range(max(matches.events_start[i], self.indexed_events), matches.events_end[i]):
+                post(self.player_events, events.player[j], j)
+                post(self.team_events, events.team[j], j)
+                post(self.kind_events, events.kind[j], j)
+                post(self.competition_events, competition, j)
+                post(self.date_events, day, j)
+        self.indexed_matches = len(matches)
+        self.indexed_events = len(events)
+
+    def matches(
+        self,
+        team: Optional[str] = None,
+        competition: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> List[int]:
+        """
+        Ids of matches passing every given filter, since and until are
+        inclusive bounds on the date of the page
+        """
+        table = self.table
+        matches = table.matches
+        reports = lambda ids: gather(matches.report, ids)
+        filters = []
+        if team is not None:
+            team_code = table.strings.lookup(team)
+            filters.append(([self.team_matches.get(team_code, ())], lambda ids: map(
+                operator.or_,
+                map(team_code.__eq__, gather(matches.host, ids)),
+                map(team_code.__eq__, gather(matches.visitor, ids)),
+            )))
+        if competition is not None:
+            competition_code = table.strings.lookup(competition)
+            filters.append(([self.competition_matches.get(competition_code, ())],
+                            lambda ids: map(competition_code.__eq__, gather(table.competition, reports(ids)))))
+        if since is not None or until is not None:
+            days = day_range(since, until)
+            filters.append((date_postings(self.date_matches, days),
+                            lambda ids: map(days.__contains__, gather(table.date, reports(ids)))))
+        return select(filters, self.indexed_matches)
+
+    def events(
+        self,
+        player: Optional[str] = None,
+        team: Optional[str] = None,
+        kinds: Optional[Iterable[EventType]] = None,
+        competition: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> List[int]:
+        """
+        Ids of events passing every given filter, see matches
+        """
+        table = self.table
+        events = table.events
+        reports = lambda ids: gather(table.matches.report, gather(events.match, ids))
+        filters = []
+        if player is not None:
+            player_code = table.strings.lookup(player)
+            filters.append(([self.player_events.get(player_code, ())],
+                            lambda ids: map(player_code.__eq__, gather(events.player, ids))))
+        if team is not None:
+            team_code = table.strings.lookup(team)
+            filters.append(([self.team_events.get(team_code, ())],
+                            lambda ids: map(team_code.__eq__, gather(events.team, ids))))
+        if kinds is not None:
+            kind_codes = {KIND_CODES[kind] for kind in kinds}
+            filters.append(([self.kind_events.get(code, ()) for code in kind_codes],
+                            lambda ids: map(kind_codes.__contains__, gather(events.kind, ids))))
+        if competition is not None:
+            competition_code = table.strings.lookup(competition)
+            filters.append(([self.competition_events.get(competition_code, ())],
+                            lambda ids: map(competition_code.__eq__, gather(table.competition, reports(ids)))))
+        if since is not None or until is not None:
+            days = day_range(since, until)
+            filters.append((date_postings(self.date_events, days),
+                            lambda ids: map(days.__contains__, gather(table.date, reports(ids)))))
+        return select(filters, self.indexed_events)
+
+    def save(self, path: str):
+        self.update()
+        table = self.table
+        state = {
+            "version": FORMAT_VERSION,
+            "itemsize": array("l").itemsize,
+            "strings": table.strings.values,
+            "reports": dump_arrays(table),
+            "matches": dump_arrays(table.matches),
+            "events": dump_arrays(table.events),
+            "postings": {name: {key: ids.tobytes() for key, ids in postings.items()}
+                         for name, postings in self.postings().items()},
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump(state, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ReportIndex":
+        with open(path, "rb") as f:
+            state = marshal.load(f)
+        if state.get("version") != FORMAT_VERSION or state.get("itemsize") != array("l").itemsize:
+            raise ValueError(f"Unsupported index file '{path}'")
+
+        table = ReportTable()
+        for value in state["strings"]:
+            table.strings.encode(value)
+        load_arrays(table, state["reports"])
+        load_arrays(table.matches, state["matches"])
+        load_arrays(table.events, state["events"])
+
+        index = cls.__new__(cls)
+        index.table = table
+        for name in POSTINGS:
+            setattr(index, name, {key: from_bytes(ids) for key, ids in state["postings"][name].items()})
+        index.indexed_matches = len(table.matches)
+        index.indexed_events = len(table.events)
+        return index
+
+    def postings(self) -> Dict[str, Postings]:
+        return {name: getattr(self, name) for name in POSTINGS}
+
+def post(postings: Postings, key: int, i: int):
+    ids = postings.get(key)
+    if ids is None:
+        ids = postings[key] = array("l")
+    ids.append(i)
+
+def day_range(since: Optional[date], until: Optional[date]) -> range:
+    return range(
+        date.min.toordinal() if since is None else since.toordinal(),
+        date.max.toordinal() + 1 if until is None else until.toordinal() + 1,
+    )
+
+def date_postings(postings: Postings, days: range) -> List[array]:
+    return [ids for day, ids in postings.items() if day in days]
+
+def gather(column: Sequence[int], ids: Sequence[int]) -> Sequence[int]:
+    """
+    column[i] for every i of ids, looked up in C
+    """
+    if len(ids) < 2:
+        return [column[i] for i in ids]
+    return itemgetter(*ids)(column)
+
+def select(filters: List[Tuple[List[Sequence[int]], Callable]], count: int) -> List[int]:
+    """
+    Sorted ids passing every filter. A filter is a list of posting lists
+    whose union it matches and a mask of which of given ids it matches,
+    checked against the table columns. Only the ids of the filter with the
+    fewest are masked by the others, so the cost follows the most selective
+    filter.
+    """
+    if not filters:
+        return list(range(count))
+    filters = sorted(filters, key=lambda f: sum(len(ids) for ids in f[0]))
+    postings, _ = filters[0]
+    ids = list(postings[0]) if len(postings) == 1 else sorted(set().union(*postings))
+    for _, mask in filters[1:]:
+        if not ids:
+            break
+        ids = list(compress(ids, mask(ids)))
+    return ids
+
+def dump_arrays(obj) -> dict:
+    return {name: (value.typecode, value.tobytes()) for name, value in vars(obj).items() if isinstance(value, array)}
+
+def load_arrays(obj, arrays: dict):
+    for name, (typecode, data) in arrays.items():
+        value = array(typecode)
+        value.frombytes(data)
+        setattr(obj, name, value)
+
+def from_bytes(data: bytes) -> array:
+    ids = array("l")
+    ids.frombytes(data)
+    return ids
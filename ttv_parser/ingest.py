@@ -0,0 +1,252 @@
+"""
+Bulk ingestion of captured pages from a directory, tar or zip archive to JSONL.
+"""
+from collections import deque
+from fnmatch import fnmatch
+import json
+import os
+from pathlib import Path
+import sys
+import tarfile
+import time
+from typing import Iterator, Optional, TextIO, Tuple
+import zipfile
+
+from ttv_parser import batch, serializer
+
+Page = Tuple[str, str]
+
+def iter_pages(source: str, pattern: str = "*.txt", skip: int = 0) -> Iterator[Page]:
+    """
+    Yields (name, text) for every page in a directory, tar or zip archive
+    without extracting it. The first skip pages are passed over unread.
+    """
+    path = Path(source)
+    if path.is_dir():
+        pages = iter_directory(path, pattern)
+    elif zipfile.is_zipfile(path):
+        pages = iter_zip(path, pattern)
+    elif tarfile.is_tarfile(path):
+        pages = iter_tar(path, pattern)
+    else:
+        raise ValueError(f"Unsupported source (path={source})")
+
+    for i, (name, read) in enumerate(pages):
+        if i >= skip:
+            yield name, read().decode("utf-8", errors="replace")
+
+def iter_directory(path: Path, pattern: str):
+    for file in sorted(p for p in path.rglob(pattern) if p.is_file()):
+        yield str(file.relative_to(path)), file.read_bytes
+
+def iter_zip(path: Path, pattern: str):
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and fnmatch(info.filename, pattern):
+                yield info.filename, lambda info=info: archive.read(info)
+
+def iter_tar(path: Path, pattern: str):
+    with tarfile.open(path, "r:*") as archive:
+        for member in archive:
+            if member.isfile() and fnmatch(member.name, pattern):
+                yield member.name, lambda member=member: archive.extractfile(member).read()
+
+class Progress:
+    def __init__(self, out: TextIO, interval: float):
+        self.out = out
+        self.interval = interval
+        self.pages = 0
+        self.matches = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.reported = self.started
+
+    def add(self, matches: int, failed: bool):
+        self.pages += 1
+        self.matches += matches
+        self.errors += failed
+        now = time.perf_counter()
+        if self.interval and now - self.reported >= self.interval:
+            self.reported = now
+            self.report()
+
+    def report(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        print(
+            f"pages={self.pages} matches={self.matches} errors={self.errors} "
+            f"pages/s={self.pages / elapsed:.1f} matches/s={self.matches / elapsed:.1f}",
+            file=self.out
+        )
+
+def read_checkpoint(checkpoint: Optional[str], source: str) -> dict:
+    """
+    Returns the number of pages done and the output offset they end at.
+    """
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return {"done": 0, "offset": None}
+    with open(checkpoint, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if state["source"] != os.path.abspath(source):
+        raise ValueError(f"Checkpoint is for another source (source={state['source']})")
+    return state
+
+def write_checkpoint(checkpoint: str, source: str, done: int, out: TextIO):
+    out.flush()
+    state = {
+        "source": os.path.abspath(source),
+        "done": done,
+        "offset": out.tell() if out.seekable() else None,
+    }
+    tmp = checkpoint + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, checkpoint)
+
+def ingest(
+    source: str,
+    out: TextIO,
+    year: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    pattern: str = "*.txt",
+    checkpoint: Optional[str] = None,
+    checkpoint_every: int = 1000,
+    progress: Optional[Progress] = None,
+    cache: Optional[str] = None,
+):
+    """
+    Parses every page of source and writes one JSON object per line to out.
+    Pages that fail to parse are written with an error instead of a report.
+    With checkpoint the number of written pages is saved every
+    checkpoint_every pages and pages already written are skipped on restart.
+    With cache parse results are kept in that cache.DiskCache file and
+    pages seen by an earlier run are not parsed again.
+    """
+    done = read_checkpoint(checkpoint, source)["done"]
+    names = deque()
+
+    def items():
+        for name, text in iter_pages(source, pattern, done):
+            names.append(name)
+            yield text
+
+    results = batch.parse_reports(items(), year, workers, chunksize, errors="return", cache=cache)
+    for res in results:
+        failed = isinstance(res, Exception)
+        line = '{"source": ' + serializer.dumps(names.popleft())
+        if failed:
+            line += ', "error": ' + serializer.dumps(f"{type(res).__name__}: {res}")
+        else:
+            line += ', "report": ' + serializer.dumps(res)
+        out.write(line + "}\n")
+
+        done += 1
+        if progress is not None:
+            progress.add(0 if failed else len(res.body), failed)
+        if checkpoint is not None and done % checkpoint_every == 0:
+            write_checkpoint(checkpoint, source, done, out)
+
+    out.flush()
+    if checkpoint is not None:
+        write_checkpoint(checkpoint, source, done, out)
+    return done
+
+def open_output(output: Optional[str], state: dict) -> TextIO:
+    """
+    Opens output for a run resuming from checkpoint state, None is
+    standard output
+    """
+    if output is None:
+        return sys.stdout
+    if state["done"] == 0:
+        return open(output, "w", encoding="utf-8")
+
+    offset = state["offset"]
+    if offset is None:
+        # Pages already done were written to standard output and would be missing from output
+        raise ValueError("Checkpoint has no output offset since the earlier run wrote to standard output")
+    if not os.path.exists(output) or os.path.getsize(output) < offset:
+        raise ValueError(f"Output is missing or shorter than the checkpoint offset (offset={offset})")
+    # Drop lines written after the last checkpoint, they are parsed again
+    out = open(output, "a", encoding="utf-8")
+    out.truncate(offset)
+    return out
+
+def main(args):
+    progress = Progress(sys.stderr, args.progress)
+    out = open_output(args.output, read_checkpoint(args.checkpoint, args.source))
+
+    try:
+        ingest(
+            args.source,
+            out,
+            year=args.year,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            pattern=args.pattern,
+            checkpoint=args.checkpoint,
+            checkpoint_every=args.checkpoint_every,
+            progress=progress,
+            cache=args.cache,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    progress.report()
+
+def add_arguments(p):
+    p.add_argument(
+        "source",
+        type=str,
+        help="Directory, tar or zip archive of captured pages."
+    )
+    p.add_argument(
+        "-o", "--output",
+        type=str,
+        help="JSONL file to write. Defaults to standard output."
+    )
+    p.add_argument(
+        "-y", "--year",
+        type=int,
+        help="Year of the pages. Defaults to current year."
+    )
+    p.add_argument(
+        "-j", "--workers",
+        type=int,
+        help="Number of parser processes. Defaults to CPU count."
+    )
+    p.add_argument(
+        "--chunksize",
+        type=int,
+        default=16,
+        help="Pages sent to a worker at a time."
+    )
+    p.add_argument(
+        "--pattern",
+        type=str,
+        default="*.txt",
+        help="Glob matched against page file names."
+    )
+    p.add_argument(
+        "--checkpoint",
+        type=str,
+        help="File to save progress to and resume from."
+    )
+    p.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=1000,
+        help="Pages between checkpoints."
+    )
+    p.add_argument(
+        "--cache",
+        type=str,
+        help="SQLite file to cache parse results in across runs."
+    )
+    p.add_argument(
+        "--progress",
+        type=float,
+        default=5.0,
+        help="Seconds between progress lines on standard error, 0 disables."
+    )
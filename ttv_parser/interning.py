@@ -0,0 +1,88 @@
+"""
+Interning of team, player and competition names.
+
+The same few thousand names repeat on every page. Passing parsed reports
+through an InternPool makes every occurrence of a name the same string
+object, saving memory and letting equality checks and dict lookups on
+those fields succeed on identity.
+"""
+from collections import OrderedDict
+import sys
+
+from ttv_parser.models import Match, Report
+
+class InternPool:
+    """
+    Least recently used strings are dropped once max_size is reached,
+    max_size None keeps every string.
+    """
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size
+        self.strings: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def __len__(self):
+        return len(self.strings)
+
+    def intern(self, value: str | None) -> str | None:
+        if value is None:
+            return None
+        canonical = self.strings.get(value)
+        if canonical is not None:
+            self.hits += 1
+            if canonical is not value:
+                self.bytes_saved += sys.getsizeof(value)
+            if self.max_size is not None:
+                self.strings.move_to_end(value)
+            return canonical
+
+        self.misses += 1
+        self.strings[value] = value
+        if self.max_size is not None and len(self.strings) > self.max_size:
+            self.strings.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def intern_match(self, match: Match) -> Match:
+        intern = self.intern
+        match.host = intern(match.host)
+        match.visitor = intern(match.visitor)
+        for event in match.events:
+            event.player = intern(event.player)
+            event.team = intern(event.team)
+        return match
+
+    def intern_report(self, report: Report) -> Report:
+        report.head.competition = self.intern(report.head.competition)
+        for match in report.body:
+            self.intern_match(match)
+        return report
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def clear(self):
+        self.strings.clear()
+
+_default_pool: InternPool | None = None
+
+def set_default_pool(pool: InternPool | None):
+    """
+    Pool used by the parser when none is passed explicitly, None disables
+    """
+    global _default_pool # pylint: disable=global-statement
+    _default_pool = pool
+
+def default_pool() -> InternPool | None:
+    return _default_pool
@@ -0,0 +1,255 @@
+"""
+Opt-in timings and counters of the parsing stages.
+
+Nothing is recorded until enable() is called, or TTV_PARSER_METRICS is set
+when ttv_parser is first imported. enable swaps the stage functions of the
+parser, tokenizer and serializer for timed wrappers and disable puts the
+originals back, so while disabled the parser runs its own functions and
+pays nothing. Metrics are kept per process, the workers of
+batch.parse_reports record their own.
+
+    metrics.enable(histograms=True)
+    ...
+    metrics.snapshot()
+    metrics.write_prometheus("/var/lib/node_exporter/textfile/ttv_parser.prom")
+
+Stages are timed from the call to the return of their functions:
+    page          parse_report and parse_scoreboard, includes the stages below
+    report_head   page head rows, either engine
+    match_head    first rows of match blocks, either engine
+    event_row     event rows, also those of LazyMatch when read
+    finish_match  sorting the events of a match and interning its names
+    serialize     serializer.dump, serializer.dumps and ModelBase.json_value
+Matches and event rows are counted as their stage calls. Pages and bytes are
+counted where text enters the parser, whichever function it enters through:
+a page per call of parse_report and parse_scoreboard or per page head row
+iter_report and iter_matches read, and the UTF-8 length of the page text or
+of the rows read.
+
+With TTV_PARSER_METRICS_HISTOGRAMS set histograms are kept as well, and with
+TTV_PARSER_METRICS_FILE set the Prometheus text is written there at exit.
+"""
+import atexit
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import wraps
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ttv_parser import parser, serializer, tokenizer
+from ttv_parser.models import ModelBase
+
+STAGES = ("page", "report_head", "match_head", "event_row", "finish_match", "serialize")
+
+# Upper bounds in seconds of the histogram buckets, the last one is +Inf
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 0.1, 1.0)
+
+@dataclass(slots=True)
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    # Observations per bucket of BUCKETS and +Inf, None without histograms
+    buckets: Optional[List[int]] = None
+
+    def record(self, seconds: float):
+        self.calls += 1
+        self.seconds += seconds
+        if self.buckets is not None:
+            self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+_stages: Dict[str, StageStats] = {name: StageStats() for name in STAGES}
+_pages = 0
+_bytes = 0
+# (owner, attribute, original value) of every replaced function
+_patched: List[Tuple[object, str, object]] = []
+
+def enabled() -> bool:
+    return bool(_patched)
+
+def enable(histograms: bool = False):
+    """
+    Starts recording, recorded values are kept. Calling it again only
+    switches histograms on or off.
+    """
+    for stats in _stages.values():
+        if not histograms:
+            stats.buckets = None
+        elif stats.buckets is None:
+            stats.buckets = [0] * (len(BUCKETS) + 1)
+    if enabled():
+        return
+
+    wrappers: Dict[Callable, Callable] = {}
+    def wrap(fn: Callable, stage: str) -> Callable:
+        if fn not in wrappers:
+            wrappers[fn] = timed(fn, _stages[stage])
+        return wrappers[fn]
+
+    for engine, (parse_head, parse_match) in parser.HEAD_ENGINES.items():
+        timed_engine = (wrap(parse_head, "report_head"), wrap(parse_match, "match_head"))
+        patch(parser.HEAD_ENGINES, engine, timed_engine)
+    for module in (parser, tokenizer):
+        patch(module, "parse_report_head", wrap(module.parse_report_head, "report_head"))
+        patch(module, "parse_match_head", wrap(module.parse_match_head, "match_head"))
+    parse_event_row = parser.parse_match_event_row_reverse
+    patch(parser, "parse_match_event_row_reverse", wrap(parse_event_row, "event_row"))
+    patch(parser, "finish_match", wrap(parser.finish_match, "finish_match"))
+    patch(parser, "parse_report", timed_page(parser.parse_report))
+    patch(parser, "parse_scoreboard", timed_page(parser.parse_scoreboard))
+    patch(parser, "iter_report", counted_stream(parser.iter_report))
+    patch(parser, "iter_matches", counted_stream(parser.iter_matches))
+    patch(serializer, "dumps", wrap(serializer.dumps, "serialize"))
+    patch(serializer, "dump", wrap(serializer.dump, "serialize"))
+    patch(ModelBase, "json_value", wrap(ModelBase.json_value, "serialize"))
+
+def disable():
+    """
+    Stops recording and restores the original functions, recorded values
+    are kept
+    """
+    while _patched:
+        owner, name, value = _patched.pop()
+        if isinstance(owner, dict):
+            owner[name] = value
+        else:
+            setattr(owner, name, value)
+
+def reset():
+    global _pages, _bytes # pylint: disable=global-statement
+    _pages = 0
+    _bytes = 0
+    for stats in _stages.values():
+        stats.calls = 0
+        stats.seconds = 0.0
+        if stats.buckets is not None:
+            stats.buckets = [0] * (len(BUCKETS) + 1)
+
+def patch(owner, name: str, value):
+    if isinstance(owner, dict):
+        _patched.append((owner, name, owner[name]))
+        owner[name] = value
+    else:
+        _patched.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+def timed(fn: Callable, stats: StageStats) -> Callable:
+    perf_counter = time.perf_counter
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats.record(perf_counter() - started)
+    return wrapper
+
+def timed_page(fn: Callable) -> Callable:
+    page = timed(fn, _stages["page"])
+
+    @wraps(fn)
+    def wrapper(report: str, *args, **kwargs):
+        global _pages, _bytes # pylint: disable=global-statement
+        _pages += 1
+        _bytes += len(report.encode("utf-8"))
+        return page(report, *args, **kwargs)
+    return wrapper
+
+def counted_stream(fn: Callable) -> Callable:
+    """
+    Wraps a function taking an iterable of rows so the rows it reads are
+    counted, as they are read
+    """
+    @wraps(fn)
+    def wrapper(lines, *args, **kwargs):
+        return fn(counted_rows(lines), *args, **kwargs)
+    return wrapper
+
+def counted_rows(lines):
+    global _pages, _bytes # pylint: disable=global-statement
+    for row in lines:
+        _bytes += len(row.encode("utf-8"))
+        if tokenizer.is_report_head(row):
+            _pages += 1
+        yield row
+
+def snapshot() -> dict:
+    """
+    Copy of the recorded values, histogram buckets are cumulative and keyed
+    by their upper bound as in Prometheus
+    """
+    stages = {}
+    for name, stats in _stages.items():
+        stage = {"calls": stats.calls, "seconds": stats.seconds}
+        if stats.buckets is not None:
+            stage["buckets"] = dict(zip(BUCKETS + (float("inf"),), cumulative(stats.buckets)))
+        stages[name] = stage
+    return {
+        "enabled": enabled(),
+        "pages": _pages,
+        "matches": _stages["match_head"].calls,
+        "event_rows": _stages["event_row"].calls,
+        "bytes": _bytes,
+        "stages": stages,
+    }
+
+def cumulative(counts: List[int]) -> List[int]:
+    ret = []
+    total = 0
+    for count in counts:
+        total += count
+        ret.append(total)
+    return ret
+
+def prometheus_text() -> str:
+    values = snapshot()
+    lines = []
+    for name in ("pages", "matches", "event_rows", "bytes"):
+        lines += [
+            f"# TYPE ttv_parser_{name}_total counter",
+            f"ttv_parser_{name}_total {values[name]}",
+        ]
+
+    stages = values["stages"]
+    lines.append("# TYPE ttv_parser_stage_calls_total counter")
+    lines += [
+        f'ttv_parser_stage_calls_total{{stage="{name}"}} {stage["calls"]}'
+        for name, stage in stages.items()
+    ]
+    lines.append("# TYPE ttv_parser_stage_seconds_total counter")
+    lines += [
+        f'ttv_parser_stage_seconds_total{{stage="{name}"}} {stage["seconds"]!r}'
+        for name, stage in stages.items()
+    ]
+
+    if any("buckets" in stage for stage in stages.values()):
+        lines.append("# TYPE ttv_parser_stage_duration_seconds histogram")
+        for name, stage in stages.items():
+            if "buckets" not in stage:
+                continue
+            metric = "ttv_parser_stage_duration_seconds"
+            for bound, count in stage["buckets"].items():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{le}"}} {count}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {stage["seconds"]!r}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {stage["calls"]}')
+    return "\n".join(lines) + "\n"
+
+def write_prometheus(path: str):
+    """
+    Writes prometheus_text() to path for a node exporter textfile collector,
+    replacing the file at once so it is never read half written
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+def enable_from_env():
+    if not os.environ.get("TTV_PARSER_METRICS"):
+        return
+    enable(histograms=bool(os.environ.get("TTV_PARSER_METRICS_HISTOGRAMS")))
+    path = os.environ.get("TTV_PARSER_METRICS_FILE")
+    if path:
+        atexit.register(write_prometheus, path)
@@ -4,38 +4,11 @@ from dataclasses import dataclass
 from datetime import date
 from functools import total_ordering
 import time
-from typing import List, Optional
 from enum import Enum
 
 def to_json_value(o: object):
-    if isinstance(o, date):
-        return o.isoformat()
-    if isinstance(o, time.struct_time):
-        return time.strftime("%H.%M", o)
-    if isinstance(o, dict):
-        ret = {}
-        for key, value in o.items():
-            ret[key] = to_json_value(value)
-            return ret
-    if isinstance(o, list):
-        ret = []
-        for item in o:
-            ret.append(to_json_value(item))
-        return ret
-    if isinstance(o, (int, float, str, bool, type(None))):
-        return o
-    if isinstance(o, ModelBase):
-        d = o.__dict__
-        ret = {}
-        if isinstance(o, Event):
-            event_type = resolve_event_type(o)
-            ret["event_type"] = event_type.value
-
-        for k, v in d.items():
-            ret[k] = to_json_value(v)
-        return ret
-
-    raise NotImplementedError(f"'{type(o)}' is not supported")
+    from ttv_parser import serializer # pylint: disable=import-outside-toplevel
+    return serializer.to_json_value(o)
 
 def resolve_event_type(event: Event):
     if isinstance(event, Goal):
@@ -60,10 +33,19 @@ class EventType(Enum):
     RED_CARD = "RED_CARD"
 
 class ModelBase(ABC):
+    # Models are slotted dataclasses, keep base free of an instance dict.
+    # Methods a model defines itself are turned off in its dataclass() call
+    # since generating them anyway adds to the import time of the parser.
+    __slots__ = ()
+
     def json_value(self):
         return to_json_value(self)
 
-@dataclass
+    def json_text(self, ensure_ascii: bool = False) -> str:
+        from ttv_parser import serializer # pylint: disable=import-outside-toplevel
+        return serializer.dumps(self, ensure_ascii)
+
+@dataclass(slots=True, init=False)
 class Event(ModelBase):
     time: EventTime
     player: str
@@ -75,7 +57,7 @@ class Event(ModelBase):
         self.team = team
 
 @total_ordering
-@dataclass
+@dataclass(slots=True, repr=False)
 class EventTime(ModelBase):
     regular: int
     added: int | None
@@ -99,32 +81,73 @@ class EventTime(ModelBase):
 
         return self.regular < other.regular
 
-@dataclass
+@dataclass(slots=True, init=False)
 class Goal(Event):
     type: str
 
     def __init__(self, time: int | EventTime, player: str, team: str, type: str):
-        super().__init__(time, player, team)
+        # dataclass(slots=True) recreates the class which breaks zero argument super()
+        Event.__init__(self, time, player, team)
         self.type = type
 
-@dataclass
+@dataclass(slots=True, init=False)
 class RedCard(Event):
     def __init__(self, time: int | EventTime, player: str, team: str):
-        super().__init__(time, player, team)
+        Event.__init__(self, time, player, team)
 
-@dataclass
+@dataclass(slots=True, init=False)
 class MissedPenalty(Event):
     def __init__(self, time: int | EventTime, player: str, team: str):
-        super().__init__(time, player, team)
+        Event.__init__(self, time, player, team)
+
+class Kickoff(int):
+    """
+    Kickoff time as minutes since midnight. Rendered as 'HH.MM' and readable
+    through tm_hour, tm_min and struct_time like the time.struct_time that
+    used to be stored.
+    """
+    __slots__ = ()
+
+    def __new__(cls, minutes: int):
+        if not 0 <= minutes < 24 * 60:
+            raise ValueError(f"Kickoff out of range (minutes={minutes})")
+        return super().__new__(cls, minutes)
+
+    @classmethod
+    def at(cls, hour: int, minute: int):
+        if not 0 <= minute < 60:
+            raise ValueError(f"Kickoff minute out of range (minute={minute})")
+        return cls(hour * 60 + minute)
+
+    @property
+    def tm_hour(self) -> int:
+        return self // 60
+
+    @property
+    def tm_min(self) -> int:
+        return self % 60
+
+    @property
+    def struct_time(self) -> time.struct_time:
+        """
+        Same value time.strptime(str(self), "%H.%M") returns
+        """
+        return time.struct_time((1900, 1, 1, self.tm_hour, self.tm_min, 0, 0, 1, -1))
+
+    def __str__(self):
+        return f"{self.tm_hour:02d}.{self.tm_min:02d}"
+
+    def __repr__(self):
+        return f"Kickoff({self})"
 
-@dataclass
+@dataclass(slots=True)
 class Match(ModelBase):
     host: str
     visitor: str
-    kickoff: time.struct_time
-    ht_score: List[int]
-    ft_score: List[int]
-    events: List[Event]
+    kickoff: Kickoff | None
+    ht_score: list[int]
+    ft_score: list[int]
+    events: list[Event]
 
     def __str__(self) -> str:
         ret = f"{self.host} vs {self.visitor} {self.score_str(self.ft_score)} ({self.score_str(self.ht_score)}) {'{'}\n"
@@ -134,15 +157,57 @@ class Match(ModelBase):
         ret += "}"
         return ret
 
-    def score_str(self, score: Optional[List[int]]):
+    @staticmethod
+    def score_str(score: list[int] | None):
         if score is None:
             return ""
         return '-'.join(map(lambda n: str(n), score))
 
-@dataclass
+# Slot holding the events of a Match, bypassed by the LazyMatch.events property
+_match_events = Match.__dict__["events"]
+
+class LazyMatch(Match):
+    """
+    Match whose events are parsed from its raw event rows when events is
+    first read. Compares, prints and serializes like the equivalent Match.
+    """
+    __slots__ = ("event_rows", "pool")
+
+    def __init__(self, host: str, visitor: str, kickoff: Kickoff | None, ht_score: list[int],
+                 ft_score: list[int], event_rows: list[str], pool=None):
+        Match.__init__(self, host, visitor, kickoff, ht_score, ft_score, None)
+        self.event_rows = event_rows
+        self.pool = pool
+
+    @property
+    def events(self) -> list[Event]:
+        events = _match_events.__get__(self, Match)
+        if events is None:
+            from ttv_parser import parser # pylint: disable=import-outside-toplevel
+            events = parser.parse_event_rows(self.event_rows, self, self.pool)
+            self.events = events
+        return events
+
+    @events.setter
+    def events(self, events: list[Event]):
+        _match_events.__set__(self, events)
+        self.event_rows = None
+        self.pool = None
+
+    @property
+    def materialized(self) -> bool:
+        return _match_events.__get__(self, Match) is not None
+
+    def __eq__(self, other):
+        if not isinstance(other, Match):
+            return NotImplemented
+        return (self.host, self.visitor, self.kickoff, self.ht_score, self.ft_score, self.events) \
+            == (other.host, other.visitor, other.kickoff, other.ht_score, other.ft_score, other.events)
+
+@dataclass(slots=True)
 class Report(ModelBase):
     head: ReportHead
-    body: List[Match]
+    body: list[Match]
 
     def __str__(self) -> str:
         head = str(self.head)
@@ -153,11 +218,35 @@ class Report(ModelBase):
 
         return ret.rstrip("\n")
 
-@dataclass
+@dataclass(slots=True)
+class MatchScore(ModelBase):
+    """
+    Teams and scores of a match without its events
+    """
+    host: str
+    visitor: str
+    kickoff: Kickoff | None
+    ht_score: list[int]
+    ft_score: list[int]
+
+    def __str__(self) -> str:
+        ft_score, ht_score = Match.score_str(self.ft_score), Match.score_str(self.ht_score)
+        return f"{self.host} vs {self.visitor} {ft_score} ({ht_score})"
+
+@dataclass(slots=True)
+class Scoreboard(ModelBase):
+    head: ReportHead
+    body: list[MatchScore]
+
+    def __str__(self) -> str:
+        head = str(self.head)
+        return "\n".join([head, "-" * len(head)] + [str(score) for score in self.body])
+
+@dataclass(slots=True)
 class ReportHead(ModelBase):
     competition: str
     date: date
-    subpages: List[int]
+    subpages: list[int]
 
     def __str__(self) -> str:
         return f"{self.competition} {self.date.isoformat()} {self.subpages}"
@@ -1,18 +1,64 @@
-from datetime import datetime
+from collections.abc import Callable, Iterable, Iterator
 import time
-from typing import List
 
-from ttv_parser.models import Event, Goal, Match, RedCard, Report, EventTime, ReportHead, MissedPenalty
-
-def parse_report(report: str, year: int = datetime.today().year) -> Report:
-    report = report.lstrip() # Only left strip to save trailing newlines to signal end of last match
+from ttv_parser import interning, tokenizer
+from ttv_parser.interning import InternPool
+from ttv_parser.models import Event, Goal, LazyMatch, Match, MatchScore, RedCard, Report, EventTime, ReportHead, \
+    MissedPenalty, Scoreboard
+
+# Bump whenever parse results for the same input change to invalidate caches
+PARSER_VERSION = 1
+
+def current_year() -> int:
+    """
+    Year used for pages when none is given, read on every call so long
+    running processes move on at the turn of the year
+    """
+    return time.localtime().tm_year
+
+def parse_report(report: str, year: int | None = None, engine: str = "tokenizer",
+                 pool: InternPool | None = None, lazy: bool = False) -> Report:
+    """
+    engine selects how report and match heads are parsed, see HEAD_ENGINES.
+    Names are interned in pool, or in interning.default_pool() if it is set.
+    With lazy matches are LazyMatch objects whose events are parsed only
+    once they are read.
+    """
+    parse_head, parse_match = HEAD_ENGINES[engine]
+    pool = interning.default_pool() if pool is None else pool
+    year = current_year() if year is None else year
+    report = report.lstrip()
     head, body_raw = report.split("\n", maxsplit=1)
     res = Report(
-        parse_report_head(head, year),
-        parse_body(body_raw)
+        intern_head(parse_head(head, year), pool),
+        parse_body(body_raw, parse_match, pool, lazy)
     )
     return res
 
+def parse_scoreboard(report: str, year: int | None = None, engine: str = "tokenizer",
+                     pool: InternPool | None = None) -> Scoreboard:
+    """
+    Head and match scores of report. Only the first row of each match block
+    is parsed, event rows are skipped without being looked into.
+    """
+    parse_head, parse_match = HEAD_ENGINES[engine]
+    pool = interning.default_pool() if pool is None else pool
+    year = current_year() if year is None else year
+    head, body_raw = report.lstrip().split("\n", maxsplit=1)
+    scores = []
+    in_block = False
+    for row in body_raw.split("\n"):
+        if not row or row.isspace():
+            in_block = False
+        elif not in_block:
+            in_block = True
+            match = parse_match(row.strip())
+            host, visitor = match.host, match.visitor
+            if pool is not None:
+                host, visitor = pool.intern(host), pool.intern(visitor)
+            scores.append(MatchScore(host, visitor, match.kickoff, match.ht_score, match.ft_score))
+    return Scoreboard(intern_head(parse_head(head, year), pool), scores)
+
 def parse_report_head(head: str, year: int):
     competition = ""
     i = 0
@@ -30,8 +76,7 @@ def parse_report_head(head: str, year: int):
         datestr += head[i]
         i += 1
 
-    date_without_year = datetime.strptime(datestr, "%d.%m.")
-    date = date_without_year.replace(year = year).date()
+    date = tokenizer.parse_date(datestr, year)
 
     while not at_number_followed_by_char(head, i, '/') and i < len(head):
         i += 1
@@ -45,26 +90,100 @@ def parse_report_head(head: str, year: int):
 
     return ReportHead(competition, date, subpages)
 
-def parse_body(body: str):
-    matches = []
-    rows = body.split("\n")
+def parse_body(body: str, parse_match=None, pool: InternPool | None = None, lazy: bool = False):
+    parse_match = parse_match or parse_match_head
+    return [
+        block for block in iter_blocks(body.split("\n"), parse_match, pool, lazy)
+        if isinstance(block, Match)
+    ]
+
+def iter_report(lines: Iterable[str], year: int | None = None, engine: str = "tokenizer",
+                pool: InternPool | None = None, lazy: bool = False) -> Iterator[tuple[ReportHead, Match]]:
+    """
+    Yields (head, match) pairs from the rows of one or many concatenated pages.
+    Each match is yielded as soon as its block ends so only a single match
+    is held in memory. Matches before the first page head have head None.
+    """
+    parse_head, parse_match = HEAD_ENGINES[engine]
+    pool = interning.default_pool() if pool is None else pool
+    year = current_year() if year is None else year
+    head = None
+    for block in iter_blocks(lines, parse_match, pool, lazy):
+        if isinstance(block, Match):
+            yield head, block
+        else:
+            head = intern_head(parse_head(block, year), pool)
+
+def iter_matches(lines: Iterable[str], engine: str = "tokenizer",
+                 pool: InternPool | None = None, lazy: bool = False) -> Iterator[Match]:
+    """
+    Like iter_report but only yields matches, page heads are skipped unparsed.
+    lines can be any iterable of rows such as an open file or sys.stdin.
+    """
+    _, parse_match = HEAD_ENGINES[engine]
+    pool = interning.default_pool() if pool is None else pool
+    for block in iter_blocks(lines, parse_match, pool, lazy):
+        if isinstance(block, Match):
+            yield block
+
+def iter_blocks(lines: Iterable[str], parse_match: Callable[[str], Match],
+                pool: InternPool | None = None, lazy: bool = False) -> Iterator[str | Match]:
+    """
+    Yields finished matches and raw page head rows in input order.
+    With lazy event rows are kept as is for LazyMatch to parse on demand.
+    """
     curr_match = None
-    for row in rows:
-        if isblank(row) and curr_match is not None and curr_match.host is not None:
-            # Could also account for end of body
-            # to remove need to keep trailing new lines around
-            curr_match.events.sort(key=lambda e: e.time)
-            matches.append(curr_match)
-            curr_match = Match(None, None, None, [], [], [])
-        elif isblank(row):
-            curr_match = Match(None, None, None, [], [], [])
-        elif curr_match.host is None:
-            curr_match = parse_match_head(row.strip())
+    rows = []
+    for row in lines:
+        if isblank(row) or tokenizer.is_report_head(row):
+            if curr_match is not None:
+                yield lazy_match(curr_match, rows, pool) if lazy else finish_match(curr_match, pool)
+                curr_match = None
+            if not isblank(row):
+                yield row
+        elif curr_match is None:
+            curr_match = parse_match(row.strip())
+            rows = []
+        elif lazy:
+            rows.append(row)
         else:
             # parse event rows in reverse to reduce ambiguity in row structure
             curr_match.events += parse_match_event_row_reverse(row, curr_match)
 
-    return matches
+    # End of input closes the last block, no trailing blank row required
+    if curr_match is not None:
+        yield lazy_match(curr_match, rows, pool) if lazy else finish_match(curr_match, pool)
+
+def finish_match(match: Match, pool: InternPool | None = None):
+    match.events.sort(key=lambda e: e.time)
+    if pool is not None:
+        pool.intern_match(match)
+    return match
+
+def lazy_match(match: Match, rows: list[str], pool: InternPool | None = None):
+    if pool is not None:
+        match.host = pool.intern(match.host)
+        match.visitor = pool.intern(match.visitor)
+    return LazyMatch(match.host, match.visitor, match.kickoff, match.ht_score, match.ft_score, rows, pool)
+
+def parse_event_rows(rows: list[str], match: Match, pool: InternPool | None = None) -> list[Event]:
+    """
+    Sorted events of the event rows of match
+    """
+    events = []
+    for row in rows:
+        events += parse_match_event_row_reverse(row, match)
+    events.sort(key=lambda e: e.time)
+    if pool is not None:
+        for event in events:
+            event.player = pool.intern(event.player)
+            event.team = pool.intern(event.team)
+    return events
+
+def intern_head(head: ReportHead, pool: InternPool | None):
+    if pool is not None:
+        head.competition = pool.intern(head.competition)
+    return head
 
 def isblank(str: str):
     return not str or str.isspace()
@@ -100,12 +219,7 @@ def parse_match_head(head: str):
             item_to_build.append(c)
             collected_character_index = i
 
-    ht_score = ft_score = None
-    if len(scoreline) == 4:
-        ht_score = scoreline[2:4]
-        ft_score = scoreline[:2]
-    elif len(scoreline) == 2:
-        ht_score = scoreline[::]
+    ht_score, ft_score = tokenizer.split_scoreline(scoreline)
 
     return Match(
         list_to_str(home_team),
@@ -117,7 +231,7 @@ def parse_match_head(head: str):
     )
 
 def parse_match_event_row_reverse(row: str, match: Match):
-    events: List[Event] = []
+    events: list[Event] = []
     event = None
     player = ""
     time = ""
@@ -199,7 +313,7 @@ def at_space_padded_dash(head: str, i: int):
         and head[i-1:i+2] == " - "
 
 def parse_match_time(timeline: str):
-    return time.strptime(timeline, "%H.%M")
+    return tokenizer.parse_kickoff(timeline)
 
 def parse_event_time(time: str):
     parts = time.split("+")
@@ -234,3 +348,8 @@ def parse_score(scoreline: str):
 
 def list_to_str(list: list):
     return "".join(list)
+
+HEAD_ENGINES = {
+    "legacy": (parse_report_head, parse_match_head),
+    "tokenizer": (tokenizer.parse_report_head, tokenizer.parse_match_head),
+}
@@ -0,0 +1,157 @@
+"""
+Polling many pages at once with asyncio.
+
+A PageSource fetches the text of a page, pages are fetched concurrently up
+to a limit and parsed on an executor. At most max_pending pages wait for or
+are being parsed at a time, fetching pauses until the executor catches up.
+Every parsed Report is sent to each sink.
+
+    source = DirectorySource("captures")
+    queue = QueueSink()
+    pipeline = Pipeline(source, [queue], year=2025, executor=ProcessPoolExecutor())
+    await pipeline.poll(["235", "236", "237"], interval=30)
+"""
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ttv_parser import batch, interning, parser
+from ttv_parser.interning import InternPool
+from ttv_parser.models import Report
+
+Result = Union[Report, Exception]
+Sink = Callable[[str, Result], Awaitable[None]]
+
+class PageSource(ABC):
+    @abstractmethod
+    async def fetch(self, page: str) -> str:
+        """
+        Current text of page
+        """
+
+class DirectorySource(PageSource):
+    """
+    Pages read from <path>/<page>.txt, e.g. captures kept on disk
+    """
+    def __init__(self, path: str, suffix: str = ".txt"):
+        self.path = Path(path)
+        self.suffix = suffix
+
+    async def fetch(self, page: str) -> str:
+        return await asyncio.to_thread((self.path / (page + self.suffix)).read_text, "utf-8")
+
+class MemorySource(PageSource):
+    """
+    Pages from a dict, which may be modified between polls
+    """
+    def __init__(self, pages: Optional[Dict[str, str]] = None):
+        self.pages = {} if pages is None else pages
+
+    async def fetch(self, page: str) -> str:
+        return self.pages[page]
+
+class QueueSink:
+    """
+    Collects (page, result) pairs into an asyncio.Queue, bounded by maxsize
+    so a slow consumer also slows down the pipeline
+    """
+    def __init__(self, maxsize: int = 0):
+        self.queue: asyncio.Queue[Tuple[str, Result]] = asyncio.Queue(maxsize)
+
+    async def __call__(self, page: str, result: Result):
+        await self.queue.put((page, result))
+
+class Pipeline:
+    """
+    With errors "raise" a failed fetch or parse stops the round, with
+    "return" the exception is sent to the sinks in place of a Report.
+    Pages whose text did not change since the previous round are skipped
+    unless skip_unchanged is False. executor None parses on the default
+    executor of the event loop.
+    """
+    def __init__(
+        self,
+        source: PageSource,
+        sinks: Iterable[Sink],
+        year: Optional[int] = None,
+        engine: str = "tokenizer",
+        fetch_concurrency: int = 8,
+        max_pending: int = 16,
+        executor: Optional[Executor] = None,
+        errors: str = "raise",
+        skip_unchanged: bool = True,
+        pool: Optional[InternPool] = None,
+    ):
+        if errors not in ("raise", "return"):
+            raise ValueError(f"Unsupported errors mode '{errors}'")
+        self.source = source
+        self.sinks = list(sinks)
+        self.year = year
+        self.engine = engine
+        self.executor = executor
+        self.errors = errors
+        self.skip_unchanged = skip_unchanged
+        self.pool = interning.default_pool() if pool is None else pool
+        self.fetch_limit = asyncio.Semaphore(fetch_concurrency)
+        self.parse_limit = asyncio.Semaphore(max_pending)
+        self.texts: Dict[str, str] = {}
+
+    async def run_once(self, pages: Iterable[str]) -> List[str]:
+        """
+        Fetches and parses every page once, returns the pages sent to sinks
+        """
+        pages = list(pages)
+        results = await asyncio.gather(*(self.process(page) for page in pages))
+        return [page for page, sent in zip(pages, results) if sent]
+
+    async def poll(self, pages: Iterable[str], interval: float, rounds: Optional[int] = None):
+        """
+        Runs a round every interval seconds, forever when rounds is None
+        """
+        pages = list(pages)
+        done = 0
+        while rounds is None or done < rounds:
+            started = asyncio.get_running_loop().time()
+            await self.run_once(pages)
+            done += 1
+            if rounds is None or done < rounds:
+                await asyncio.sleep(max(0.0, interval - (asyncio.get_running_loop().time() - started)))
+
+    async def process(self, page: str) -> bool:
+        async with self.fetch_limit:
+            try:
+                text = await self.source.fetch(page)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                if self.errors == "raise":
+                    raise
+                await self.send(page, e)
+                return True
+            if self.skip_unchanged and self.texts.get(page) == text:
+                return False
+            # Backpressure, the fetch slot is held until there is room to parse
+            await self.parse_limit.acquire()
+
+        try:
+            result = await self.parse(text)
+        finally:
+            self.parse_limit.release()
+        if isinstance(result, Exception):
+            if self.errors == "raise":
+                raise result
+        else:
+            self.texts[page] = text
+        await self.send(page, result)
+        return True
+
+    async def parse(self, text: str) -> Result:
+        year = parser.current_year() if self.year is None else self.year
+        chunk = await asyncio.get_running_loop().run_in_executor(
+            self.executor, batch.parse_chunk, [(0, text, year)], self.engine, "return"
+        )
+        return next(batch.unpack_chunk(chunk, True, self.pool))
+
+    async def send(self, page: str, result: Result):
+        for sink in self.sinks:
+            await sink(page, result)
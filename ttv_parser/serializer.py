@@ -0,0 +1,137 @@
+"""
+JSON serialization of models.
+
+Encoders are compiled once per class from its dataclass fields and cached so
+serializing a value is a single dict lookup on its type instead of a chain
+of isinstance checks. Alongside json values, JSON text can be written
+straight to a file with dump without building the value tree first.
+"""
+from dataclasses import fields
+from datetime import date
+from json.encoder import encode_basestring, encode_basestring_ascii
+import time
+from typing import Callable, Dict, TextIO
+
+from ttv_parser.models import Event, Goal, Kickoff, ModelBase, Report, resolve_event_type
+
+GOAL_EVENT_TYPES = {
+    "m": "GOAL",
+    "om": "OWN_GOAL",
+    "rp": "PENALTY",
+}
+
+def identity(o):
+    return o
+
+_VALUE_ENCODERS: Dict[type, Callable] = {
+    str: identity,
+    int: identity,
+    float: identity,
+    bool: identity,
+    type(None): identity,
+    date: lambda o: o.isoformat(),
+    time.struct_time: lambda o: time.strftime("%H.%M", o),
+    Kickoff: str,
+}
+
+_TEXT_ENCODERS: Dict[bool, Dict[type, Callable]] = {}
+
+def to_json_value(o: object):
+    encode = _VALUE_ENCODERS.get(type(o))
+    if encode is None:
+        encode = _VALUE_ENCODERS[type(o)] = build_encoder(type(o), _VALUE_ENCODERS, value_encoder)
+    return encode(o)
+
+# Containers recurse through to_json_value so are added once it is defined
+_VALUE_ENCODERS[list] = lambda o: [to_json_value(item) for item in o]
+_VALUE_ENCODERS[dict] = lambda o: {key: to_json_value(value) for key, value in o.items()}
+
+def to_json_text(o: object, ensure_ascii: bool = False) -> str:
+    encoders = _TEXT_ENCODERS.get(ensure_ascii)
+    if encoders is None:
+        encoders = _TEXT_ENCODERS[ensure_ascii] = text_encoders(ensure_ascii)
+    encode = encoders.get(type(o))
+    if encode is None:
+        compile_model = lambda cls: text_encoder(cls, ensure_ascii)
+        encode = encoders[type(o)] = build_encoder(type(o), encoders, compile_model)
+    return encode(o)
+
+def dumps(o: object, ensure_ascii: bool = False) -> str:
+    """
+    Same text as json.dumps(o.json_value(), ensure_ascii=ensure_ascii)
+    """
+    return to_json_text(o, ensure_ascii)
+
+def dump(o: object, fp: TextIO, ensure_ascii: bool = False):
+    """
+    Writes o as JSON text to fp. Reports are written a match at a time.
+    """
+    if not isinstance(o, Report):
+        fp.write(to_json_text(o, ensure_ascii))
+        return
+
+    fp.write('{"head": ' + to_json_text(o.head, ensure_ascii) + ', "body": [')
+    for i, match in enumerate(o.body):
+        fp.write((", " if i else "") + to_json_text(match, ensure_ascii))
+    fp.write("]}")
+
+def text_encoders(ensure_ascii: bool) -> Dict[type, Callable]:
+    encode_str = encode_basestring_ascii if ensure_ascii else encode_basestring
+    return {
+        str: encode_str,
+        int: int.__repr__,
+        float: float.__repr__,
+        bool: lambda o: "true" if o else "false",
+        type(None): lambda o: "null",
+        list: lambda o: "[" + ", ".join([
+            to_json_text(item, ensure_ascii) for item in o
+        ]) + "]",
+        dict: lambda o: "{" + ", ".join([
+            encode_str(str(key)) + ": " + to_json_text(value, ensure_ascii)
+            for key, value in o.items()
+        ]) + "}",
+        date: lambda o: '"' + o.isoformat() + '"',
+        time.struct_time: lambda o: encode_str(time.strftime("%H.%M", o)),
+        Kickoff: lambda o: '"' + str(o) + '"',
+    }
+
+def build_encoder(cls: type, encoders: dict, compile_model: Callable):
+    if issubclass(cls, ModelBase):
+        return compile_model(cls)
+
+    # Subclasses of supported types e.g. datetime use their base's encoder
+    for base in cls.__mro__:
+        if base in encoders:
+            return encoders[base]
+
+    raise NotImplementedError(f"'{cls}' is not supported")
+
+def value_encoder(cls: type):
+    items = [f"{name!r}: value(o.{name})" for name in field_names(cls)]
+    if issubclass(cls, Event):
+        items.insert(0, "'event_type': event_type(o)")
+    source = "def encode(o):\n    return {" + ", ".join(items) + "}"
+    return compile_encoder(source, value=to_json_value)
+
+def text_encoder(cls: type, ensure_ascii: bool):
+    parts = [
+        f"{encode_basestring(name) + ': '!r} + text(o.{name}, {ensure_ascii})"
+        for name in field_names(cls)
+    ]
+    if issubclass(cls, Event):
+        parts.insert(0, "'\"event_type\": \"' + event_type(o) + '\"'")
+    source = "def encode(o):\n    return '{' + " + " + ', ' + ".join(parts) + " + '}'"
+    return compile_encoder(source, text=to_json_text)
+
+def compile_encoder(source: str, **namespace):
+    namespace["event_type"] = event_type_value
+    exec(source, namespace) # pylint: disable=exec-used
+    return namespace["encode"]
+
+def field_names(cls: type):
+    return [f.name for f in fields(cls)]
+
+def event_type_value(event: Event) -> str:
+    if type(event) is Goal and event.type in GOAL_EVENT_TYPES: # pylint: disable=unidiomatic-typecheck
+        return GOAL_EVENT_TYPES[event.type]
+    return resolve_event_type(event).value
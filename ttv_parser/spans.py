@@ -0,0 +1,187 @@
+"""
+Span based scanning of pages and concatenated captures.
+
+scan locates match blocks and the team names and scoreline of their head
+row as (start, end) offsets into the original text without building any
+strings. Field values are materialized only when read, so searching a large
+capture for a few matches allocates next to nothing for the rest.
+
+    for span in scan(capture):
+        if span.has_team("Wolverhampton"):
+            print(span.match())
+"""
+import re
+from typing import Iterator, List, Optional
+
+from ttv_parser import parser, tokenizer
+from ttv_parser.interning import InternPool
+from ttv_parser.models import Event, Kickoff, Match, ReportHead
+
+# A run of consecutive rows that are not blank
+_NON_BLANK_ROWS = re.compile(r"^[^\S\n]*\S.*(?:\n[^\S\n]*\S.*)*", re.MULTILINE)
+
+class MatchSpan:
+    """
+    Offsets of a match block in text. head_start and head_end locate the
+    head row of the page the match is on, both are -1 before the first one.
+    """
+    __slots__ = (
+        "text", "head_start", "head_end", "start", "end",
+        "host_start", "host_end", "visitor_start", "visitor_end", "tail_start", "tail_end", "events_start",
+    )
+
+    def __init__(self, text: str, head_start: int, head_end: int, start: int, end: int, host_start: int,
+                 host_end: int, visitor_start: int, visitor_end: int, tail_start: int, tail_end: int,
+                 events_start: int):
+        self.text = text
+        self.head_start = head_start
+        self.head_end = head_end
+        self.start = start
+        self.end = end
+        self.host_start = host_start
+        self.host_end = host_end
+        self.visitor_start = visitor_start
+        self.visitor_end = visitor_end
+        self.tail_start = tail_start
+        self.tail_end = tail_end
+        self.events_start = events_start
+
+    def __repr__(self):
+        return f"MatchSpan({self.start}, {self.end})"
+
+    @property
+    def host(self) -> str:
+        return tokenizer.normalize_name(self.text[self.host_start:self.host_end])
+
+    @property
+    def visitor(self) -> str:
+        return tokenizer.normalize_name(self.text[self.visitor_start:self.visitor_end])
+
+    @property
+    def scoreline(self) -> str:
+        """
+        Score or kickoff time as on the page e.g. '2-1 (1-0)'
+        """
+        return self.text[self.tail_start:self.tail_end]
+
+    @property
+    def kickoff(self) -> Optional[Kickoff]:
+        return self.head_match().kickoff
+
+    @property
+    def ht_score(self) -> Optional[List[int]]:
+        return self.head_match().ht_score
+
+    @property
+    def ft_score(self) -> Optional[List[int]]:
+        return self.head_match().ft_score
+
+    @property
+    def events(self) -> List[Event]:
+        return self.match().events
+
+    @property
+    def event_rows(self) -> List[str]:
+        if self.events_start >= self.end:
+            return []
+        return self.text[self.events_start:self.end].split("\n")
+
+    def has_team(self, name: str) -> bool:
+        """
+        Whether name is the host or the visitor. Compared in place unless a
+        name contains column padding.
+        """
+        return self.field_is(self.host_start, self.host_end, name) \
+            or self.field_is(self.visitor_start, self.visitor_end, name)
+
+    def mentions(self, player: str) -> bool:
+        """
+        Whether an event of the match is by player
+        """
+        if self.text.find(player, self.events_start, self.end) == -1:
+            return False
+        return any(event.player == player for event in self.events)
+
+    def field_is(self, start: int, end: int, value: str) -> bool:
+        if end - start == len(value) and self.text.startswith(value, start):
+            return True
+        # Padding within the field is dropped on materialization
+        return "  " in self.text[start:end] and tokenizer.normalize_name(self.text[start:end]) == value
+
+    def report_head(self, year: int) -> Optional[ReportHead]:
+        if self.head_start < 0:
+            return None
+        return tokenizer.parse_report_head(self.text[self.head_start:self.head_end], year)
+
+    def head_match(self) -> Match:
+        return tokenizer.parse_match_head(self.text[self.host_start:self.tail_end])
+
+    def match(self, pool: Optional[InternPool] = None) -> Match:
+        match = self.head_match()
+        match.events = parser.parse_event_rows(self.event_rows, match, pool)
+        if pool is not None:
+            match.host = pool.intern(match.host)
+            match.visitor = pool.intern(match.visitor)
+        return match
+
+def scan(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[MatchSpan]:
+    """
+    Spans of every match block in text[start:end], which may hold one or
+    many concatenated pages. start must be at the beginning of a row.
+    """
+    end = len(text) if end is None else end
+    head_start = head_end = -1
+    for rows in _NON_BLANK_ROWS.finditer(text, start, end):
+        rows_start, rows_end = rows.span()
+        if text.find("/", rows_start, rows_end) == -1:
+            # No page head among the rows so they are a single match block
+            yield block_span(text, rows_start, rows_end, head_start, head_end)
+            continue
+
+        # A page head ends the block before it and the next row starts a new one
+        block_start = None
+        pos = rows_start
+        while pos <= rows_end:
+            row_end = text.find("\n", pos, rows_end)
+            row_end = rows_end if row_end == -1 else row_end
+            if tokenizer.is_report_head(text[pos:row_end]):
+                if block_start is not None:
+                    yield block_span(text, block_start, pos - 1, head_start, head_end)
+                    block_start = None
+                head_start, head_end = pos, row_end
+            elif block_start is None:
+                block_start = pos
+            pos = row_end + 1
+        if block_start is not None:
+            yield block_span(text, block_start, rows_end, head_start, head_end)
+
+def block_span(text: str, start: int, end: int, head_start: int, head_end: int) -> MatchSpan:
+    row_end = text.find("\n", start, end)
+    row_end = end if row_end == -1 else row_end
+    host_start, host_end, visitor_start, visitor_end, tail_start, tail_end = head_spans(text, start, row_end)
+    return MatchSpan(text, head_start, head_end, start, end, host_start, host_end, visitor_start,
+                     visitor_end, tail_start, tail_end, min(row_end + 1, end))
+
+def head_spans(text: str, start: int, end: int) -> tuple:
+    """
+    Offsets of the fields of the match head row text[start:end], located
+    like tokenizer.parse_match_head does
+    """
+    start, end = strip_span(text, start, end)
+    tail_start, _ = tokenizer.match_tail(text, start, end)
+
+    separator = text.find(" - ", start, tail_start)
+    if separator == -1:
+        host = strip_span(text, start, tail_start)
+        visitor = (tail_start, tail_start)
+    else:
+        host = strip_span(text, start, separator)
+        visitor = strip_span(text, separator + 3, tail_start)
+    return host + visitor + (tail_start, end)
+
+def strip_span(text: str, start: int, end: int):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
@@ -0,0 +1,180 @@
+"""
+League tables and player leaderboards kept up to date report by report.
+
+Every match is identified by its competition, page date and teams and
+remembered with what it contributed. A match reported again replaces its
+previous contribution, so re-reading a page changes nothing and a corrected
+scoreline or event list only updates the rows it touches.
+
+Own goals (Goal.type "om") are listed under the team they count for but
+scored by a player of the other team, they count in the table and the
+player's own_goals but not in the scorer list. Penalties ("rp") count as
+goals and in penalties.
+"""
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from ttv_parser.models import Goal, Match, MissedPenalty, RedCard, Report
+
+MatchKey = Tuple[str, date, str, str]
+# Final score and (player, team, stat) of each event
+Contribution = Tuple[Optional[Tuple[int, int]], Tuple[Tuple[str, str, str], ...]]
+
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+@dataclass(slots=True)
+class TableRow:
+    team: str
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+
+    @property
+    def points(self) -> int:
+        return WIN_POINTS * self.won + DRAW_POINTS * self.drawn
+
+    @property
+    def goal_difference(self) -> int:
+        return self.goals_for - self.goals_against
+
+@dataclass(slots=True)
+class PlayerStats:
+    player: str
+    team: str
+    goals: int = 0
+    penalties: int = 0
+    own_goals: int = 0
+    missed_penalties: int = 0
+    red_cards: int = 0
+
+    def empty(self) -> bool:
+        return not (self.goals or self.own_goals or self.missed_penalties or self.red_cards)
+
+class Standings:
+    """
+    With live, matches still in progress count with their current score,
+    otherwise only matches with a final score are counted.
+    """
+    def __init__(self, live: bool = False):
+        self.live = live
+        self.matches: Dict[MatchKey, Contribution] = {}
+        self.tables: Dict[str, Dict[str, TableRow]] = {}
+        self.players: Dict[str, Dict[Tuple[str, str], PlayerStats]] = {}
+
+    def add_report(self, report: Report) -> int:
+        """
+        Returns the number of matches whose contribution changed
+        """
+        head = report.head
+        return sum(self.add_match(head.competition, head.date, match) for match in report.body)
+
+    def add_match(self, competition: str, day: date, match: Match) -> bool:
+        key = (competition, day, match.host, match.visitor)
+        contribution = self.contribution(match)
+        previous = self.matches.get(key)
+        if previous == contribution:
+            return False
+
+        if previous is not None:
+            self.apply(key, previous, -1)
+        if contribution is None:
+            self.matches.pop(key, None)
+        else:
+            self.matches[key] = contribution
+            self.apply(key, contribution, 1)
+        return True
+
+    def remove_match(self, competition: str, day: date, host: str, visitor: str) -> bool:
+        key = (competition, day, host, visitor)
+        previous = self.matches.pop(key, None)
+        if previous is None:
+            return False
+        self.apply(key, previous, -1)
+        return True
+
+    def contribution(self, match: Match) -> Optional[Contribution]:
+        score = match.ft_score
+        if score is None and self.live and match.kickoff is None:
+            # Until the final score is known the live score is in ht_score
+            score = match.ht_score
+        if score is None:
+            return None
+
+        events = []
+        for event in match.events:
+            if isinstance(event, Goal) and event.type == "om":
+                opponent = match.visitor if event.team == match.host else match.host
+                events.append((event.player, opponent, "own_goals"))
+            elif isinstance(event, Goal):
+                events.append((event.player, event.team, "goals"))
+                if event.type == "rp":
+                    events.append((event.player, event.team, "penalties"))
+            elif isinstance(event, MissedPenalty):
+                events.append((event.player, event.team, "missed_penalties"))
+            elif isinstance(event, RedCard):
+                events.append((event.player, event.team, "red_cards"))
+        return tuple(score), tuple(events)
+
+    def apply(self, key: MatchKey, contribution: Contribution, sign: int):
+        competition, _, host, visitor = key
+        (host_goals, visitor_goals), events = contribution
+        table = self.tables.setdefault(competition, {})
+        self.apply_result(table, host, host_goals, visitor_goals, sign)
+        self.apply_result(table, visitor, visitor_goals, host_goals, sign)
+
+        players = self.players.setdefault(competition, {})
+        for player, team, stat in events:
+            stats = players.get((player, team))
+            if stats is None:
+                stats = players[(player, team)] = PlayerStats(player, team)
+            setattr(stats, stat, getattr(stats, stat) + sign)
+            if stats.empty():
+                del players[(player, team)]
+
+    @staticmethod
+    def apply_result(table: Dict[str, TableRow], team: str, goals_for: int, goals_against: int, sign: int):
+        row = table.get(team)
+        if row is None:
+            row = table[team] = TableRow(team)
+        row.played += sign
+        row.goals_for += sign * goals_for
+        row.goals_against += sign * goals_against
+        if goals_for > goals_against:
+            row.won += sign
+        elif goals_for < goals_against:
+            row.lost += sign
+        else:
+            row.drawn += sign
+        if row.played == 0:
+            del table[team]
+
+    def table(self, competition: str) -> List[TableRow]:
+        """
+        Copies of the rows ordered by points, goal difference, goals scored
+        and name
+        """
+        return sorted(
+            (replace(row) for row in self.tables.get(competition, {}).values()),
+            key=lambda row: (-row.points, -row.goal_difference, -row.goals_for, row.team)
+        )
+
+    def scorers(self, competition: str, limit: Optional[int] = None) -> List[PlayerStats]:
+        return self.leaderboard(competition, "goals", limit)
+
+    def cards(self, competition: str, limit: Optional[int] = None) -> List[PlayerStats]:
+        return self.leaderboard(competition, "red_cards", limit)
+
+    def leaderboard(self, competition: str, stat: str, limit: Optional[int] = None) -> List[PlayerStats]:
+        """
+        Copies of the stats of players with stat above zero, most first
+        """
+        ret = sorted(
+            (stats for stats in self.players.get(competition, {}).values() if getattr(stats, stat) > 0),
+            key=lambda stats: (-getattr(stats, stat), stats.player, stats.team)
+        )
+        return [replace(stats) for stats in (ret if limit is None else ret[:limit])]
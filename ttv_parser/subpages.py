@@ -0,0 +1,100 @@
+"""
+Assembling a page that spans several subpages ("1/3", "2/3", ...) into one
+report.
+"""
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from ttv_parser import batch, interning, parser
+from ttv_parser.interning import InternPool
+from ttv_parser.models import Match, Report, ReportHead
+
+class SubpageError(ValueError):
+    pass
+
+@dataclass(slots=True)
+class ReportSet:
+    """
+    Subpages of one page by subpage number. missing lists the numbers of
+    subpages that were not given and duplicates those given more than once.
+    """
+    head: ReportHead
+    subpages: Dict[int, Report] = field(default_factory=dict)
+    missing: List[int] = field(default_factory=list)
+    duplicates: List[int] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+    @property
+    def body(self) -> List[Match]:
+        return [match for number in sorted(self.subpages) for match in self.subpages[number].body]
+
+    def report(self) -> Report:
+        """
+        Single report of the matches of every subpage in order. The subpage
+        counter of its head is the number of subpages merged out of the total.
+        """
+        count = [len(self.subpages), self.head.subpages[1]]
+        head = ReportHead(self.head.competition, self.head.date, count)
+        return Report(head, self.body)
+
+def parse_subpages(texts: List[str], year: Optional[int] = None, engine: str = "tokenizer",
+                   executor: Optional[Executor] = None, strict: bool = False,
+                   pool: Optional[InternPool] = None) -> ReportSet:
+    """
+    Parses the subpages of one page, given in any order, into a ReportSet.
+    With executor the subpages are parsed concurrently on it, a process pool
+    kept alive between calls avoids paying its start up on every update.
+    Subpages of another competition, date or subpage count raise
+    SubpageError, as do missing and duplicate subpages with strict. Of
+    duplicates the one given last is kept.
+    """
+    if not texts:
+        raise ValueError("No subpages given")
+
+    year = parser.current_year() if year is None else year
+    pool = interning.default_pool() if pool is None else pool
+    reports = parse_all(texts, year, engine, executor, pool)
+
+    first = reports[0].head
+    total = first.subpages[1]
+    res = ReportSet(ReportHead(first.competition, first.date, [1, total]))
+    for report in reports:
+        head = report.head
+        if (head.competition, head.date, head.subpages[1]) \
+                != (first.competition, first.date, total):
+            raise SubpageError(
+                f"Subpage {counter(head)} of {head.competition} {head.date} "
+                f"does not belong to {first.competition} {first.date} of {total} subpages"
+            )
+        number = head.subpages[0]
+        if not 1 <= number <= head.subpages[1]:
+            raise SubpageError(f"Invalid subpage counter {counter(head)}")
+        if number in res.subpages and number not in res.duplicates:
+            res.duplicates.append(number)
+        res.subpages[number] = report
+
+    res.missing = [number for number in range(1, total + 1) if number not in res.subpages]
+    res.duplicates.sort()
+    if strict and (res.missing or res.duplicates):
+        raise SubpageError(f"Missing subpages {res.missing}, duplicate subpages {res.duplicates}")
+    return res
+
+def counter(head: ReportHead):
+    return "/".join(str(n) for n in head.subpages)
+
+def parse_all(texts: List[str], year: int, engine: str, executor: Optional[Executor],
+              pool: Optional[InternPool]) -> List[Report]:
+    if executor is None:
+        return [parser.parse_report(text, year, engine=engine, pool=pool) for text in texts]
+
+    futures = [
+        executor.submit(batch.parse_chunk, [(i, text, year)], engine)
+        for i, text in enumerate(texts)
+    ]
+    return [
+        report for future in futures for report in batch.unpack_chunk(future.result(), True, pool)
+    ]
@@ -0,0 +1,262 @@
+"""
+Columnar storage for large collections of parsed reports.
+
+Integer fields are kept in typed arrays and strings are dictionary encoded
+into a pool shared by every string column, so a season of reports costs a
+few bytes per field instead of a Python object per value. Rows are turned
+back into models only when asked for.
+"""
+from array import array
+from datetime import date
+from typing import Iterable, Iterator, List, Optional
+
+from ttv_parser.models import Event, EventTime, EventType, Goal, Kickoff, Match, MissedPenalty, RedCard, Report, \
+    ReportHead, resolve_event_type
+
+NONE = -1
+
+EVENT_KINDS = list(EventType)
+KIND_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+GOAL_KINDS = (EventType.GOAL, EventType.OWN_GOAL, EventType.PENALTY)
+GOAL_TYPES = {
+    EventType.GOAL: "m",
+    EventType.OWN_GOAL: "om",
+    EventType.PENALTY: "rp",
+}
+
+class StringPool:
+    """
+    Maps each distinct string to a small integer code, None is NONE
+    """
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code == NONE else self.values[code]
+
+    def lookup(self, value: str) -> Optional[int]:
+        """
+        Code of an already stored value without adding it
+        """
+        return self.codes.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+def optional(value: Optional[int]):
+    return NONE if value is None else value
+
+def from_optional(value: int):
+    return None if value == NONE else value
+
+class EventTable:
+    def __init__(self, strings: StringPool):
+        self.strings = strings
+        self.match = array("l")
+        self.kind = array("b")
+        self.minute = array("h")
+        self.added = array("h")
+        self.player = array("l")
+        self.team = array("l")
+
+    def __len__(self):
+        return len(self.kind)
+
+    def append(self, match_row: int, event: Event):
+        self.match.append(match_row)
+        self.kind.append(KIND_CODES[resolve_event_type(event)])
+        self.minute.append(event.time.regular)
+        self.added.append(optional(event.time.added))
+        self.player.append(self.strings.encode(event.player))
+        self.team.append(self.strings.encode(event.team))
+
+    def row(self, i: int) -> Event:
+        kind = EVENT_KINDS[self.kind[i]]
+        event_time = EventTime(self.minute[i], from_optional(self.added[i]))
+        player = self.strings.decode(self.player[i])
+        team = self.strings.decode(self.team[i])
+        if kind == EventType.RED_CARD:
+            return RedCard(event_time, player, team)
+        if kind == EventType.MISSED_PENALTY:
+            return MissedPenalty(event_time, player, team)
+        return Goal(event_time, player, team, GOAL_TYPES[kind])
+
+    def scan(
+        self,
+        kinds: Optional[Iterable[EventType]] = None,
+        team: Optional[str] = None,
+        player: Optional[str] = None,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Row indices of events matching every given filter. after and before
+        are exclusive bounds on the regular minute.
+        """
+        rows = range(len(self))
+        if team is not None:
+            rows = self.filter_code(rows, self.team, self.strings.lookup(team))
+        if player is not None:
+            rows = self.filter_code(rows, self.player, self.strings.lookup(player))
+        if kinds is not None:
+            codes = {KIND_CODES[kind] for kind in kinds}
+            kind = self.kind
+            rows = [i for i in rows if kind[i] in codes]
+        if after is not None:
+            minute = self.minute
+            rows = [i for i in rows if minute[i] > after]
+        if before is not None:
+            minute = self.minute
+            rows = [i for i in rows if minute[i] < before]
+        return list(rows)
+
+    @staticmethod
+    def filter_code(rows: Iterable[int], column: array, code: Optional[int]):
+        if code is None:
+            return []
+        if not isinstance(rows, range):
+            return [i for i in rows if column[i] == code]
+
+        # Let array.index scan the whole column in C between hits
+        found = []
+        i = -1
+        while True:
+            try:
+                i = column.index(code, i + 1)
+            except ValueError:
+                return found
+            found.append(i)
+
+class MatchTable:
+    def __init__(self, strings: StringPool):
+        self.strings = strings
+        self.report = array("l")
+        self.host = array("l")
+        self.visitor = array("l")
+        self.kickoff = array("h")
+        self.ht_home = array("h")
+        self.ht_visitor = array("h")
+        self.ft_home = array("h")
+        self.ft_visitor = array("h")
+        self.events_start = array("l")
+        self.events_end = array("l")
+
+    def __len__(self):
+        return len(self.host)
+
+    def append(self, report_row: int, match: Match, events: EventTable):
+        row = len(self)
+        self.report.append(report_row)
+        self.host.append(self.strings.encode(match.host))
+        self.visitor.append(self.strings.encode(match.visitor))
+        self.kickoff.append(optional(match.kickoff))
+        append_score(match.ht_score, self.ht_home, self.ht_visitor)
+        append_score(match.ft_score, self.ft_home, self.ft_visitor)
+        self.events_start.append(len(events))
+        for event in match.events:
+            events.append(row, event)
+        self.events_end.append(len(events))
+
+    def row(self, i: int, events: EventTable) -> Match:
+        kickoff = self.kickoff[i]
+        return Match(
+            self.strings.decode(self.host[i]),
+            self.strings.decode(self.visitor[i]),
+            None if kickoff == NONE else Kickoff(kickoff),
+            score(self.ht_home[i], self.ht_visitor[i]),
+            score(self.ft_home[i], self.ft_visitor[i]),
+            [events.row(j) for j in range(self.events_start[i], self.events_end[i])]
+        )
+
+    def scan(self, team: Optional[str] = None) -> List[int]:
+        """
+        Row indices of matches where team played either side
+        """
+        if team is None:
+            return list(range(len(self)))
+        code = self.strings.lookup(team)
+        return [i for i, (host, visitor) in enumerate(zip(self.host, self.visitor)) if code in (host, visitor)]
+
+def append_score(score_pair: Optional[List[int]], home: array, visitor: array):
+    home.append(NONE if score_pair is None else score_pair[0])
+    visitor.append(NONE if score_pair is None else score_pair[1])
+
+def score(home: int, visitor: int):
+    return None if home == NONE else [home, visitor]
+
+class ReportTable:
+    """
+    Reports with their matches and events stored column by column
+    """
+    def __init__(self):
+        self.strings = StringPool()
+        self.matches = MatchTable(self.strings)
+        self.events = EventTable(self.strings)
+        self.competition = array("l")
+        self.date = array("l")
+        self.subpage = array("h")
+        self.subpage_count = array("h")
+        self.matches_start = array("l")
+        self.matches_end = array("l")
+
+    def __len__(self):
+        return len(self.competition)
+
+    def append(self, report: Report):
+        row = len(self)
+        head = report.head
+        self.competition.append(self.strings.encode(head.competition))
+        self.date.append(head.date.toordinal())
+        self.subpage.append(head.subpages[0])
+        self.subpage_count.append(head.subpages[1])
+        self.matches_start.append(len(self.matches))
+        for match in report.body:
+            self.matches.append(row, match, self.events)
+        self.matches_end.append(len(self.matches))
+
+    def extend(self, reports: Iterable[Report]):
+        for report in reports:
+            self.append(report)
+
+    def report(self, i: int) -> Report:
+        head = ReportHead(
+            self.strings.decode(self.competition[i]),
+            date.fromordinal(self.date[i]),
+            [self.subpage[i], self.subpage_count[i]]
+        )
+        return Report(head, [self.match(j) for j in range(self.matches_start[i], self.matches_end[i])])
+
+    def match(self, i: int) -> Match:
+        return self.matches.row(i, self.events)
+
+    def event(self, i: int) -> Event:
+        return self.events.row(i)
+
+    def reports(self) -> Iterator[Report]:
+        for i in range(len(self)):
+            yield self.report(i)
+
+    def iter_matches(self, rows: Optional[Iterable[int]] = None) -> Iterator[Match]:
+        for i in range(len(self.matches)) if rows is None else rows:
+            yield self.match(i)
+
+    def iter_events(self, rows: Optional[Iterable[int]] = None) -> Iterator[Event]:
+        for i in range(len(self.events)) if rows is None else rows:
+            yield self.event(i)
+
+    def head_of_match(self, i: int):
+        """
+        Competition and date of the report the match belongs to
+        """
+        report = self.matches.report[i]
+        return self.strings.decode(self.competition[report]), date.fromordinal(self.date[report])
@@ -0,0 +1,158 @@
+"""
+Single pass tokenizer for report and match heads.
+
+Produces the same ReportHead and Match values as the character by character
+functions in ttv_parser.parser but locates tokens with precompiled patterns
+so the cost stays linear in the length of the head.
+"""
+from datetime import date
+import re
+
+from ttv_parser.models import Kickoff, Match, ReportHead
+
+_REPORT_DATE = re.compile(r"\d\.")
+_REPORT_DATE_TOKEN = re.compile(r"(\d{1,2})\.(\d{1,2})\.")
+_SUBPAGES = re.compile(r"\d/")
+_MATCH_TAIL = re.compile(r"\d([-.])")
+_NUMBER = re.compile(r"\d+")
+_NON_BLANK = re.compile(r"\S*")
+_WHITESPACE_RUN = re.compile(r"\s\s+")
+_WHITESPACE = re.compile(r"\s")
+_KICKOFF = re.compile(r"(\d{1,2})\.(\d{1,2})")
+# Date and subpage counter ending a page head. Whitespace excludes newlines
+# so archive can search whole files with the same pattern as bytes.
+REPORT_HEAD_END = r"(\d{1,2})\.(\d{1,2})\.[^\S\n]+(\d+)/(\d+)[^\S\n]*$"
+_REPORT_HEAD_END = re.compile(REPORT_HEAD_END)
+
+def is_report_head(row: str):
+    """
+    Page heads end with the date and subpage counter e.g. 'COMPETITION  dd.mm.  n/m'
+    """
+    # Cheap check first since match rows never contain a slash
+    return "/" in row and _REPORT_HEAD_END.search(row) is not None
+
+def parse_report_head(head: str, year: int):
+    date_match = _REPORT_DATE.search(head)
+    if date_match is None:
+        raise ValueError(f"No date in report head '{head}'")
+
+    date_start = number_start(head, date_match.start())
+    competition = " ".join(head[:date_start].split())
+    datestr = _NON_BLANK.match(head, date_start).group()
+    report_date = parse_date(datestr, year)
+
+    date_end = date_start + len(datestr)
+    subpage_match = _SUBPAGES.search(head, date_end)
+    if subpage_match is None:
+        raise ValueError(f"No subpage counter in report head '{head}'")
+
+    subpage_start = max(number_start(head, subpage_match.start()), date_end)
+    subpages = _NON_BLANK.match(head, subpage_start).group()
+
+    return ReportHead(competition, report_date, parse_score(subpages))
+
+def match_tail(head: str, start: int = 0, end: int | None = None) -> tuple[int, str | None]:
+    """
+    Where the score or kickoff at the end of head[start:end] begins, and '-'
+    for a score, '.' for a kickoff or None when there is neither
+    """
+    end = len(head) if end is None else end
+    tail_match = _MATCH_TAIL.search(head, start, end)
+    if tail_match is None:
+        return end, None
+    return max(number_start(head, tail_match.start()), start), tail_match.group(1)
+
+def parse_match_head(head: str):
+    head = head.strip()
+    tail_start, tail_kind = match_tail(head)
+    names = head[:tail_start]
+
+    # Only the first space padded dash separates teams, names may contain dashes
+    separator = names.find(" - ")
+    if separator == -1:
+        home_team, visitor_team = names, ""
+    else:
+        home_team, visitor_team = names[:separator], names[separator + 3:]
+
+    kickoff = None
+    scoreline = []
+    if tail_kind == "-":
+        scoreline = parse_score(head[tail_start:])
+    elif tail_kind is not None:
+        kickoff = parse_kickoff(head[tail_start:])
+
+    ht_score, ft_score = split_scoreline(scoreline)
+
+    return Match(
+        normalize_name(home_team),
+        normalize_name(visitor_team),
+        kickoff,
+        ht_score,
+        ft_score,
+        []
+    )
+
+# Pages only ever contain a few hundred distinct dates and kickoff times
+_dates: dict[tuple[str, int], date] = {}
+_kickoffs: dict[str, Kickoff] = {}
+
+def parse_date(datestr: str, year: int) -> date:
+    """
+    'dd.mm.' of the given year
+    """
+    ret = _dates.get((datestr, year))
+    if ret is None:
+        day_and_month = _REPORT_DATE_TOKEN.fullmatch(datestr)
+        if day_and_month is None:
+            raise ValueError(f"time data '{datestr}' does not match format '%d.%m.'")
+        day, month = day_and_month.groups()
+        ret = _dates[(datestr, year)] = date(year, int(month), int(day))
+    return ret
+
+def parse_kickoff(timestr: str) -> Kickoff:
+    """
+    'HH.MM' as minutes since midnight
+    """
+    ret = _kickoffs.get(timestr)
+    if ret is None:
+        hour_and_minute = _KICKOFF.fullmatch(timestr)
+        if hour_and_minute is None:
+            raise ValueError(f"time data '{timestr}' does not match format '%H.%M'")
+        hour, minute = hour_and_minute.groups()
+        ret = _kickoffs[timestr] = Kickoff.at(int(hour), int(minute))
+    return ret
+
+def number_start(text: str, last_digit: int):
+    """
+    Patterns anchor on the last digit of a number since a leading digit run
+    would be rescanned from every start index. Walk back to where it begins.
+    """
+    i = last_digit
+    while i > 0 and text[i - 1].isdigit():
+        i -= 1
+    return i
+
+def normalize_name(name: str):
+    # Single spaces separate words, longer runs are column padding
+    name = _WHITESPACE_RUN.sub("", name.strip())
+    return _WHITESPACE.sub(" ", name)
+
+def split_scoreline(scoreline: list[int]) -> tuple[list[int] | None, list[int] | None]:
+    """
+    (ht_score, ft_score) of a parsed scoreline, a scoreline of two numbers
+    only sets ht_score
+    """
+    if len(scoreline) == 4:
+        return scoreline[2:4], scoreline[:2]
+    if len(scoreline) == 2:
+        return scoreline[::], None
+    return None, None
+
+def parse_score(scoreline: str) -> list[int]:
+    ret = [int(n) for n in _NUMBER.findall(scoreline)]
+
+    # A match ending 0-0 does not have separate first/second half scores
+    if ret == [0, 0]:
+        return [0, 0, 0, 0]
+
+    return ret
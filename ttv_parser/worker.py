@@ -0,0 +1,126 @@
+"""
+Long running parse worker speaking NDJSON.
+
+Each request is a line {"id": ..., "page": "<page text>"} with optional
+"year" and "engine". Each response is a line {"id": ..., "report": {...}}
+or {"id": ..., "error": "..."} in request order. Requests may be written
+without waiting for responses, and the parse cache and interned names stay
+warm between them.
+
+    python -m ttv_parser worker                      # stdin and stdout
+    python -m ttv_parser worker --socket /tmp/ttv.sock
+"""
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from typing import TextIO
+
+from ttv_parser import parser, serializer
+from ttv_parser.cache import ParseCache
+from ttv_parser.interning import InternPool
+
+class Worker:
+    """
+    cache_entries sets the size of the cache of parse results keyed by page
+    text, 0 disables it
+    """
+    def __init__(self, cache_entries: int = 1024):
+        self.cache = ParseCache(cache_entries, copy=False) if cache_entries else None
+        # Handlers of concurrent socket connections share the cache
+        self.lock = threading.Lock()
+        # Kept on the worker so parse_report elsewhere in the process is unaffected
+        self.pool = InternPool(max_size=100_000)
+
+    def handle(self, line: str) -> str:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            year = request.get("year") or parser.current_year()
+            engine = request.get("engine", "tokenizer")
+            with self.lock:
+                if self.cache is not None:
+                    report = self.cache.parse_report(request["page"], year, engine, pool=self.pool)
+                else:
+                    report = parser.parse_report(request["page"], year, engine=engine, pool=self.pool)
+            return '{"id": ' + json.dumps(request_id) + ', "report": ' + serializer.dumps(report) + "}"
+        except Exception as e: # pylint: disable=broad-exception-caught
+            error = f"{type(e).__name__}: {e}"
+            return '{"id": ' + json.dumps(request_id) + ', "error": ' + serializer.dumps(error) + "}"
+
+    def serve(self, infile: TextIO, outfile: TextIO):
+        """
+        Answers every request line of infile until it ends
+        """
+        for line in infile:
+            if line.isspace():
+                continue
+            outfile.write(self.handle(line) + "\n")
+            outfile.flush()
+
+    def serve_socket(self, path: str):
+        """
+        Serves every connection to a Unix domain socket at path in its own thread
+        """
+        with self.make_server(path) as server:
+            server.serve_forever()
+
+    def make_server(self, path: str) -> socketserver.ThreadingUnixStreamServer:
+        worker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                lines = (line.decode("utf-8") for line in self.rfile)
+                worker.serve(lines, SocketWriter(self.wfile))
+
+        # Only a socket left behind by an earlier worker is replaced, one
+        # still accepting connections belongs to a running worker
+        try:
+            mode = os.stat(path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"{path} exists and is not a socket")
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(path)
+                except ConnectionRefusedError:
+                    os.remove(path)
+                else:
+                    raise FileExistsError(f"A worker is already listening on {path}")
+        return socketserver.ThreadingUnixStreamServer(path, Handler)
+
+class SocketWriter:
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text: str):
+        self.wfile.write(text.encode("utf-8"))
+
+    def flush(self):
+        self.wfile.flush()
+
+def main(args):
+    worker = Worker(args.cache_entries)
+    if args.socket is None:
+        worker.serve(sys.stdin, sys.stdout)
+    else:
+        worker.serve_socket(args.socket)
+
+def add_arguments(p):
+    p.add_argument(
+        "--socket",
+        type=str,
+        help="Unix domain socket to listen on instead of standard input and output."
+    )
+    p.add_argument(
+        "--cache-entries",
+        type=int,
+        default=1024,
+        help="Parse results to keep for repeated pages, 0 disables."
+    )